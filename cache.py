@@ -0,0 +1,69 @@
+"""Content-addressed cache for transcription, diarization and summary results.
+
+Entries are keyed by SHA-256 of their inputs, so re-running the pipeline on
+the same audio/transcript returns the earlier result instead of redoing the
+GPU or API work. Delete the cache directory to force a full re-run.
+"""
+
+import hashlib
+import json
+import os
+import tempfile
+from pathlib import Path
+
+CACHE_DIR = Path(os.environ.get("VIDEO_CONVERTER_CACHE_DIR", Path.home() / ".cache" / "video-converter"))
+
+
+def file_digest(path: Path) -> str:
+    """SHA-256 of a file, read in chunks (audio files can be hundreds of MB)."""
+    with open(path, "rb") as f:
+        return hashlib.file_digest(f, "sha256").hexdigest()
+
+
+def text_digest(*parts: str) -> str:
+    """SHA-256 over several strings (e.g. model, language, transcript)."""
+    h = hashlib.sha256()
+    for part in parts:
+        h.update(part.encode("utf-8"))
+        h.update(b"\0")
+    return h.hexdigest()
+
+
+def _entry(key: str, kind: str) -> Path:
+    return CACHE_DIR / f"{key}.{kind}"
+
+
+def _write_atomic(path: Path, data: bytes) -> None:
+    """Write via a temp file + os.replace, so readers never see a partial entry."""
+    path.parent.mkdir(parents=True, exist_ok=True)
+    with tempfile.NamedTemporaryFile(dir=path.parent, prefix=".tmp-", delete=False) as tmp:
+        tmp.write(data)
+    os.replace(tmp.name, path)
+
+
+def load_text(key: str, kind: str) -> str | None:
+    try:
+        return _entry(key, kind).read_text(encoding="utf-8")
+    except FileNotFoundError:
+        return None
+
+
+def save_text(key: str, kind: str, text: str) -> None:
+    try:
+        _write_atomic(_entry(key, kind), text.encode("utf-8"))
+    except OSError as e:
+        print(f"  ⚠️  Cache nicht geschrieben: {e}")
+
+
+def load_json(key: str, kind: str):
+    try:
+        return json.loads(_entry(key, kind).read_bytes())
+    except (FileNotFoundError, ValueError):
+        return None
+
+
+def save_json(key: str, kind: str, data) -> None:
+    try:
+        _write_atomic(_entry(key, kind), json.dumps(data, ensure_ascii=False).encode("utf-8"))
+    except OSError as e:
+        print(f"  ⚠️  Cache nicht geschrieben: {e}")
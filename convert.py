@@ -2,12 +2,22 @@
 """Video processing pipeline: compress, transcribe, and organize meeting recordings."""
 
 import argparse
+import atexit
+import functools
+import hashlib
+import itertools
 import json
+import mmap
 import os
+import queue
 import re
+import secrets
 import subprocess
 import sys
 import tempfile
+import threading
+import time
+from concurrent.futures import Future, ProcessPoolExecutor, ThreadPoolExecutor, as_completed
 from datetime import datetime
 from pathlib import Path
 
@@ -15,19 +25,133 @@ from pathlib import Path
 SCRIPT_DIR = Path(__file__).parent
 INPUT_DIR = SCRIPT_DIR / "files"
 OUTPUT_DIR = Path(os.environ.get("VIDEO_CONVERTER_OUTPUT_DIR", SCRIPT_DIR / "converted"))
-VIDEO_EXTENSIONS = {".mov", ".mp4", ".mkv", ".avi", ".webm", ".m4v"}
+# String prefixes for "is this path inside OUTPUT_DIR" (as given and symlink-resolved)
+_OUTPUT_PREFIXES = tuple({str(OUTPUT_DIR.absolute()) + os.sep, str(OUTPUT_DIR.resolve()) + os.sep})
+VIDEO_EXTENSIONS = frozenset({".mov", ".mp4", ".mkv", ".avi", ".webm", ".m4v"})
+_VIDEO_SUFFIXES = tuple(VIDEO_EXTENSIONS)  # for str.endswith
+
+# HEVC encoders in order of preference (fastest first)
+HEVC_ENCODERS = ("hevc_nvenc", "hevc_qsv", "hevc_vaapi", "hevc_amf", "hevc_videotoolbox", "libx265")
+ENCODER_CHOICES = {
+    "nvenc": "hevc_nvenc",
+    "qsv": "hevc_qsv",
+    "vaapi": "hevc_vaapi",
+    "vt": "hevc_videotoolbox",
+    "sw": "libx265",
+}
+VAAPI_DEVICE = "/dev/dri/renderD128"
 
+# MP4 layout: fragmented output is streamable as written; +faststart needs a second pass
+# that rewrites the whole file to move the moov atom to the front
+MOVFLAGS_FRAGMENTED = "+frag_keyframe+empty_moov+default_base_moof"
+MOVFLAGS_CLASSIC = "+faststart"
 
-WEEKDAYS_DE = {
-    0: "Montag",
-    1: "Dienstag",
-    2: "Mittwoch",
-    3: "Donnerstag",
-    4: "Freitag",
-    5: "Samstag",
-    6: "Sonntag"
+# Scaling presets: target width, height follows proportionally (divisible by 2)
+SCALE_WIDTHS = {
+    "1080p": 1920,
+    "720p": 1280,
 }
 
+# Encoder watchdog: a hardware encode slower than this for this long is restarted in software
+STALL_SPEED = 0.05
+STALL_SECONDS = 60
+
+# Parallel processing limits
+MAX_HW_JOBS = 2  # Hardware encoders (VideoToolbox, NVENC, ...) saturate with more parallel sessions
+FFMPEG_THREADS_PER_JOB = 4  # Rough thread budget per libx265 encode
+
+# Temporary WAVs for Whisper (16 kHz mono s16le) go to RAM-backed /dev/shm when it has room
+SHM_DIR = "/dev/shm"
+WAV_BYTES_PER_SECOND = 16000 * 2
+# Name prefix of our WAVs in SHM_DIR; the expected size follows, so parallel jobs see each other's reservations
+SHM_WAV_PREFIX = "video-converter-"
+
+
+# Filename sanitizing: problematic characters are replaced or dropped in one pass
+_SANITIZE_TABLE = str.maketrans({
+    '/': '-',
+    '\\': '-',
+    ':': '-',
+    '*': '',
+    '?': '',
+    '"': '',
+    '<': '',
+    '>': '',
+    '|': '-',
+})
+_DASH_RE = re.compile(r'[-\s]+')
+
+# Recording datetime in filenames
+_DT_RE = re.compile(r'(\d{4})-(\d{2})-(\d{2}) um (\d{2})\.(\d{2})\.(\d{2})')
+_FOLDER_DT_RE = re.compile(r'(\d{4})-(\d{2})-(\d{2})_\w+_(\d{2})-(\d{2})')
+
+# Timestamp line in transcript.txt: [MM:SS - MM:SS] or [HH:MM:SS - HH:MM:SS]
+_TRANSCRIPT_TS_RE = re.compile(r'\[(\d{1,2}:\d{2}(?::\d{2})?) - (\d{1,2}:\d{2}(?::\d{2})?)\]')
+
+# Topic indicators for the heuristic title fallback
+_TOPIC_RES = [
+    re.compile(p, re.IGNORECASE) for p in (
+        r'(?:sprechen|reden) (?:über|wir über) (.+?)(?:\.|,|$)',
+        r'(?:Thema|Aufgabe|Projekt)[:\s]+(.+?)(?:\.|,|$)',
+        r'(?:geht es um|geht um) (.+?)(?:\.|,|$)',
+    )
+]
+
+
+# Indexed by datetime.weekday() (0 = Monday)
+WEEKDAYS_DE = (
+    "Montag",
+    "Dienstag",
+    "Mittwoch",
+    "Donnerstag",
+    "Freitag",
+    "Samstag",
+    "Sonntag",
+)
+
+# Sibling modules are imported once. Their heavy dependencies (torch/whisper/pyannote,
+# anthropic) are optional: compression works without them.
+if str(SCRIPT_DIR) not in sys.path:
+    sys.path.insert(0, str(SCRIPT_DIR))
+import cache
+# transcribe (torch/whisper/pyannote) is imported on first use, see _transcribe_module():
+# --compress-only runs and encode worker processes never load it
+_transcribe = None
+_TRANSCRIBE_IMPORT_ERROR = None
+# transcribe.load_whisper caches the model, so a batch loads it only once
+WHISPER_MODEL = "turbo"
+try:
+    from summarize import (
+        load_transcript, extract_timestamps_and_text, INSIGHTS_SEGMENTS,
+        generate_summary, generate_insights_with_timestamps
+    )
+except ImportError:
+    generate_summary = None
+try:
+    import anthropic
+except ImportError:
+    anthropic = None
+
+# Titles are 2-5 words: a small model on a short excerpt is enough
+TITLE_MODEL = "claude-haiku-4-5"
+TITLE_EXCERPT_BYTES = 2000
+TITLE_SYSTEM_PROMPT = (
+    "Du erzeugst kurze, prägnante Titel (2-5 Wörter, auf Deutsch) für Meeting-Transkripte. "
+    "Der Titel beschreibt das Hauptthema des Meetings. "
+    "Antworte NUR mit dem Titel, ohne Anführungszeichen oder zusätzlichen Text."
+)
+
+# Claude API client: imported and created lazily, then shared by title and summary calls
+_client = None
+
+
+def _get_anthropic_client(api_key: str):
+    """Return a shared Anthropic client so all Claude calls reuse one connection pool."""
+    global _client
+    if _client is None or _client.api_key != api_key:
+        _client = anthropic.Anthropic(api_key=api_key)
+    return _client
+
 
 def get_recording_name(video_path: Path) -> str:
     """Extract recording name from filename (without extension)."""
@@ -42,13 +166,13 @@ def parse_recording_datetime(filename: str) -> datetime | None:
       - '2026-01-28_Mittwoch_09-47_Title' (renamed folder)
     """
     # Pattern 1: "Bildschirmaufnahme YYYY-MM-DD um HH.MM.SS"
-    match = re.search(r'(\d{4})-(\d{2})-(\d{2}) um (\d{2})\.(\d{2})\.(\d{2})', filename)
+    match = _DT_RE.search(filename)
     if match:
         year, month, day, hour, minute, second = map(int, match.groups())
         return datetime(year, month, day, hour, minute, second)
 
     # Pattern 2: "YYYY-MM-DD_Weekday_HH-MM_Title" (renamed folder)
-    match = re.match(r'(\d{4})-(\d{2})-(\d{2})_\w+_(\d{2})-(\d{2})', filename)
+    match = _FOLDER_DT_RE.match(filename)
     if match:
         year, month, day, hour, minute = map(int, match.groups())
         return datetime(year, month, day, hour, minute)
@@ -56,90 +180,97 @@ def parse_recording_datetime(filename: str) -> datetime | None:
     return None
 
 
+def _transcribe_module():
+    """Import transcribe.py on first use; None if its dependencies are missing (see _TRANSCRIBE_IMPORT_ERROR)."""
+    global _transcribe, _TRANSCRIBE_IMPORT_ERROR
+    if _transcribe is None and _TRANSCRIBE_IMPORT_ERROR is None:
+        try:
+            import transcribe
+            _transcribe = transcribe
+        except ImportError as e:
+            _TRANSCRIBE_IMPORT_ERROR = str(e)
+    return _transcribe
+
+
+def _file_size(path: Path) -> int:
+    """Size of path in bytes, 0 if it does not exist (one stat instead of exists() + stat())."""
+    try:
+        return path.stat().st_size
+    except FileNotFoundError:
+        return 0
+
+
 def extract_title_from_transcript(transcript_path: Path, api_key: str = None) -> str | None:
     """Extract a meaningful title from the transcript."""
-    if not transcript_path.exists():
+    # mmap cannot map an empty file
+    if not _file_size(transcript_path):
         return None
 
-    content = transcript_path.read_text(encoding="utf-8")
-
-    # If we have an API key, use Claude to generate a title
-    if api_key:
-        try:
-            import anthropic
-            client = anthropic.Anthropic(api_key=api_key)
-
-            # Use first 8000 chars to stay within limits
-            excerpt = content[:8000]
-
-            message = client.messages.create(
-                model="claude-sonnet-4-20250514",
-                max_tokens=100,
-                messages=[{
-                    "role": "user",
-                    "content": f"""Analysiere dieses Meeting-Transkript und gib einen kurzen, prägnanten Titel zurück (2-5 Wörter, auf Deutsch).
-Der Titel sollte das Hauptthema des Meetings beschreiben.
-Antworte NUR mit dem Titel, ohne Anführungszeichen oder zusätzlichen Text.
-
-Transkript:
-{excerpt}"""
-                }]
-            )
-            title = message.content[0].text.strip()
-            # Clean up: remove quotes, limit length
-            title = title.strip('"\'')
-            if len(title) > 50:
-                title = title[:50]
-            return title
-        except Exception as e:
-            print(f"  ⚠️  Titel-Generierung fehlgeschlagen: {e}")
-
-    # Fallback: Try to extract from content heuristically
-    # Look for common patterns like "sprechen über", "Thema", etc.
-    lines = [l.strip() for l in content.split('\n') if l.strip() and not l.startswith('[')]
-
-    # Skip very short segments, look for substantive content
-    for line in lines[5:30]:  # Skip first few lines (usually greetings)
-        if len(line) > 20:
-            # Look for topic indicators
-            topic_patterns = [
-                r'(?:sprechen|reden) (?:über|wir über) (.+?)(?:\.|,|$)',
-                r'(?:Thema|Aufgabe|Projekt)[:\s]+(.+?)(?:\.|,|$)',
-                r'(?:geht es um|geht um) (.+?)(?:\.|,|$)',
-            ]
-            for pattern in topic_patterns:
-                match = re.search(pattern, line, re.IGNORECASE)
-                if match:
-                    topic = match.group(1).strip()
-                    if 5 < len(topic) < 50:
-                        return topic.title()
+    # Map the file instead of decoding it completely: only the excerpt/first lines are needed
+    with open(transcript_path, "rb") as f, mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ) as mm:
+        # If we have an API key (and the SDK is installed), use Claude to generate a title
+        if api_key and anthropic is not None:
+            try:
+                client = _get_anthropic_client(api_key)
+
+                # The opening of the meeting is enough for a title (only this part is decoded)
+                excerpt = mm[:TITLE_EXCERPT_BYTES].decode("utf-8", errors="ignore")
+
+                message = client.messages.create(
+                    model=TITLE_MODEL,
+                    max_tokens=100,
+                    system=TITLE_SYSTEM_PROMPT,
+                    messages=[{
+                        "role": "user",
+                        "content": f"Transkript:\n{excerpt}"
+                    }]
+                )
+                title = message.content[0].text.strip()
+                # Clean up: remove quotes, limit length
+                title = title.strip('"\'')
+                if len(title) > 50:
+                    title = title[:50]
+                return title
+            except Exception as e:
+                print(f"  ⚠️  Titel-Generierung fehlgeschlagen: {e}")
+
+        # Fallback: Try to extract from content heuristically
+        # Look for common patterns like "sprechen über", "Thema", etc.
+        # Lazily read line by line, so only the lines up to the window end are touched
+        lines = (stripped for raw in iter(mm.readline, b"") if (stripped := raw.strip()) and not raw.startswith(b"["))
+
+        # Skip very short segments, look for substantive content
+        for raw_line in itertools.islice(lines, 5, 30):  # Skip first few lines (usually greetings)
+            line = raw_line.decode("utf-8", errors="ignore")
+            if len(line) > 20:
+                # Look for topic indicators
+                for pattern in _TOPIC_RES:
+                    match = pattern.search(line)
+                    if match:
+                        topic = match.group(1).strip()
+                        if 5 < len(topic) < 50:
+                            return topic.title()
 
     return None
 
 
 def sanitize_filename(name: str) -> str:
     """Remove or replace characters that are problematic in filenames."""
-    # Replace problematic characters
-    replacements = {
-        '/': '-',
-        '\\': '-',
-        ':': '-',
-        '*': '',
-        '?': '',
-        '"': '',
-        '<': '',
-        '>': '',
-        '|': '-',
-    }
-    for old, new in replacements.items():
-        name = name.replace(old, new)
-    # Remove multiple spaces/dashes
-    name = re.sub(r'[-\s]+', '-', name)
-    return name.strip('-')
+    # Replace problematic characters, then collapse multiple spaces/dashes
+    return _DASH_RE.sub('-', name.translate(_SANITIZE_TABLE)).strip('-')
 
 
-def generate_folder_name(recording_name: str, transcript_path: Path = None, api_key: str = None) -> str:
-    """Generate a descriptive folder name with date, weekday, time and title."""
+def generate_folder_name(
+    recording_name: str,
+    transcript_path: Path = None,
+    api_key: str = None,
+    title: str = None
+) -> str:
+    """Generate a descriptive folder name with date, weekday, time and title.
+
+    A title that was already generated can be passed in; otherwise it is
+    extracted from the transcript.
+    """
     dt = parse_recording_datetime(recording_name)
 
     if dt:
@@ -148,8 +279,7 @@ def generate_folder_name(recording_name: str, transcript_path: Path = None, api_
         time_str = dt.strftime("%H-%M")
 
         # Try to get a title
-        title = None
-        if transcript_path:
+        if title is None and transcript_path:
             title = extract_title_from_transcript(transcript_path, api_key)
 
         if title:
@@ -166,39 +296,90 @@ def rename_output_folder(old_path: Path, new_name: str) -> Path:
     """Rename the output folder to a more descriptive name."""
     new_path = old_path.parent / new_name
 
-    # Handle collision
+    # Handle collision: one deterministic short suffix instead of probing _2, _3, ...
     if new_path.exists() and new_path != old_path:
-        counter = 2
-        base_name = new_name
-        while new_path.exists():
-            new_name = f"{base_name}_{counter}"
-            new_path = old_path.parent / new_name
-            counter += 1
+        suffix = hashlib.blake2b(str(old_path).encode(), digest_size=3).hexdigest()
+        new_path = old_path.parent / f"{new_name}_{suffix}"
 
     if old_path != new_path:
-        old_path.rename(new_path)
+        try:
+            old_path.rename(new_path)
+        except OSError:
+            # Name taken in the meantime (e.g. parallel run): retry once with a random suffix
+            new_path = old_path.parent / f"{new_name}_{secrets.token_hex(4)}"
+            old_path.rename(new_path)
 
     return new_path
 
 
-def get_video_info(input_path: Path) -> dict:
-    """Get video duration and resolution using ffprobe."""
+@functools.lru_cache(maxsize=128)
+def _video_info_cached(path_str: str, mtime_ns: int) -> dict:
+    """Run ffprobe once per (path, mtime); a rewritten file gets a new cache entry."""
     cmd = [
         "ffprobe", "-v", "error",
-        "-select_streams", "v:0",
-        "-show_entries", "format=duration:stream=width,height",
-        "-of", "json", str(input_path)
+        "-show_entries", "format=duration:stream=codec_type,codec_name,width,height",
+        "-of", "json", path_str
     ]
     result = subprocess.run(cmd, capture_output=True, text=True)
     if result.returncode == 0:
-        import json
         data = json.loads(result.stdout)
         duration = float(data.get("format", {}).get("duration", 0))
-        streams = data.get("streams", [{}])
-        width = streams[0].get("width", 0) if streams else 0
-        height = streams[0].get("height", 0) if streams else 0
-        return {"duration": duration, "width": width, "height": height}
-    return {"duration": 0, "width": 0, "height": 0}
+        streams = data.get("streams", [])
+        video = next((st for st in streams if st.get("codec_type") == "video"), {})
+        width = video.get("width", 0)
+        height = video.get("height", 0)
+        audio = next((st for st in streams if st.get("codec_type") == "audio"), None)
+        return {
+            "duration": duration, "width": width, "height": height,
+            "video_codec": video.get("codec_name"),
+            "has_audio": audio is not None,
+            "audio_codec": audio.get("codec_name") if audio else None,
+        }
+    return {"duration": 0, "width": 0, "height": 0, "video_codec": None, "has_audio": False, "audio_codec": None}
+
+
+def _shm_reserved() -> int:
+    """Bytes our in-flight WAVs in SHM_DIR are still going to write (all processes)."""
+    reserved = 0
+    with os.scandir(SHM_DIR) as entries:
+        for entry in entries:
+            if not entry.name.startswith(SHM_WAV_PREFIX):
+                continue
+            try:
+                needed = int(entry.name[len(SHM_WAV_PREFIX):].split("-", 1)[0])
+                reserved += max(0, needed - entry.stat().st_size)
+            except (ValueError, OSError):
+                continue
+    return reserved
+
+
+def temp_wav_for(video_path: Path) -> Path:
+    """Create an empty temporary WAV for video_path's audio, in RAM when it fits."""
+    try:
+        duration = get_video_info(video_path)["duration"]
+    except OSError:
+        duration = 0
+    # Unknown duration: assume 3 hours rather than risk filling /dev/shm
+    needed = int((duration or 3 * 3600) * WAV_BYTES_PER_SECOND)
+
+    if os.path.isdir(SHM_DIR) and os.access(SHM_DIR, os.W_OK):
+        # Reserve first (the name carries the expected size), then check against all reservations
+        with tempfile.NamedTemporaryFile(prefix=f"{SHM_WAV_PREFIX}{needed}-", suffix=".wav",
+                                         delete=False, dir=SHM_DIR) as tmp:
+            path = Path(tmp.name)
+        st = os.statvfs(SHM_DIR)
+        # Leave at least as much free as this WAV needs (it is shared RAM; Docker defaults to 64 MB)
+        if st.f_bavail * st.f_frsize - _shm_reserved() > needed:
+            return path
+        path.unlink(missing_ok=True)
+
+    with tempfile.NamedTemporaryFile(suffix=".wav", delete=False) as tmp:
+        return Path(tmp.name)
+
+
+def get_video_info(input_path: Path) -> dict:
+    """Get video duration, resolution and audio stream info using ffprobe (cached per file version)."""
+    return dict(_video_info_cached(str(input_path), input_path.stat().st_mtime_ns))
 
 
 def format_duration(seconds: float) -> str:
@@ -213,44 +394,307 @@ def format_duration(seconds: float) -> str:
 
 def is_video_valid(path: Path) -> bool:
     """Check if video file exists, is non-empty, and has valid duration."""
-    if not path.exists() or path.stat().st_size == 0:
+    try:
+        st = path.stat()
+    except FileNotFoundError:
+        return False
+    if st.st_size == 0:
         return False
     try:
-        cmd = [
-            "ffprobe", "-v", "error",
-            "-show_entries", "format=duration",
-            "-of", "json", str(path)
-        ]
-        result = subprocess.run(cmd, capture_output=True, text=True)
-        if result.returncode != 0:
-            return False
-        data = json.loads(result.stdout)
-        duration = float(data.get("format", {}).get("duration", 0))
-        return duration > 0
+        return _video_info_cached(str(path), st.st_mtime_ns)["duration"] > 0
     except Exception:
         return False
 
 
 def is_transcript_valid(path: Path, min_size: int = 100) -> bool:
     """Check if transcript file exists and has meaningful content."""
-    return path.exists() and path.stat().st_size >= min_size
+    return _file_size(path) >= min_size
 
 
 def is_summary_valid(output_dir: Path) -> bool:
     """Check if a summary file exists and is non-empty in the output directory."""
     for name in ("summary.txt", "summary.md"):
-        p = output_dir / name
-        if p.exists() and p.stat().st_size > 0:
+        if _file_size(output_dir / name) > 0:
             return True
     return False
 
 
+@functools.lru_cache(maxsize=1)
+def available_encoders() -> frozenset[str]:
+    """Return the encoder names compiled into the local ffmpeg (queried once)."""
+    try:
+        result = subprocess.run(
+            ["ffmpeg", "-hide_banner", "-encoders"],
+            capture_output=True, text=True
+        )
+    except FileNotFoundError:
+        return frozenset()
+    # Encoder lines follow a "------" separator: " V....D hevc_nvenc  NVIDIA NVENC hevc encoder"
+    names = set()
+    in_list = False
+    for line in result.stdout.splitlines():
+        if line.strip() == "------":
+            in_list = True
+        elif in_list and len(parts := line.split()) >= 2:
+            names.add(parts[1])
+    return frozenset(names)
+
+
+def hevc_encoder_args(
+    encoder: str,
+    quality: int,
+    threads: int = None
+) -> tuple[list[str], list[str], list[str], str]:
+    """Build ffmpeg arguments for a HEVC encoder.
+
+    Returns (input_args, filters, codec_args, mode_info). input_args go before
+    "-i", filters are appended to the video filter chain. threads caps the
+    software encoder when several encodes run in parallel.
+    """
+    # Hardware encoders use 0-51 quantizers (lower = better), map from 0-100 (higher = better)
+    qp = str(round(51 * (100 - quality) / 100))
+    if encoder == "hevc_nvenc":
+        return [], [], ["-c:v", "hevc_nvenc", "-preset", "p4", "-rc", "vbr", "-cq", qp], f"Hardware (NVENC, cq={qp})"
+    if encoder == "hevc_qsv":
+        return [], [], ["-c:v", "hevc_qsv", "-global_quality", qp], f"Hardware (Quick Sync, q={qp})"
+    if encoder == "hevc_vaapi":
+        return (
+            ["-vaapi_device", VAAPI_DEVICE],
+            ["format=nv12|vaapi", "hwupload"],
+            ["-c:v", "hevc_vaapi", "-qp", qp],
+            f"Hardware (VAAPI, qp={qp})",
+        )
+    if encoder == "hevc_amf":
+        return [], [], ["-c:v", "hevc_amf", "-rc", "cqp", "-qp_i", qp, "-qp_p", qp], f"Hardware (AMF, qp={qp})"
+    if encoder == "hevc_videotoolbox":
+        return [], [], ["-c:v", "hevc_videotoolbox", "-q:v", str(quality)], f"Hardware (VideoToolbox, q={quality})"
+    if encoder == "copy":
+        # Source is already HEVC: only rewrite the container
+        return [], [], ["-c:v", "copy"], "REMUX (HEVC wird übernommen, keine Neukodierung)"
+    # Software encoder: slower but better compression
+    codec_args = ["-c:v", "libx265", "-crf", "28", "-preset", "medium"]
+    mode_info = "Software (libx265, CRF 28)"
+    if threads:
+        # x265 sizes its worker pool and frame parallelism separately, both need the cap
+        codec_args.extend(["-threads", str(threads), "-x265-params", f"pools={threads}:frame-threads=2"])
+        mode_info = f"Software (libx265, CRF 28, {threads} Threads)"
+    return [], [], codec_args, mode_info
+
+
+@functools.lru_cache(maxsize=None)
+def encoder_works(encoder: str) -> bool:
+    """Check that an encoder is usable on this machine with a tiny test encode.
+
+    ffmpeg builds often list hardware encoders without the matching GPU being present.
+    """
+    if encoder not in available_encoders():
+        return False
+    input_args, filters, codec_args, _ = hevc_encoder_args(encoder, 50)
+    cmd = ["ffmpeg", "-hide_banner", "-v", "error", *input_args,
+           "-f", "lavfi", "-i", "color=black:s=256x256:d=0.1"]
+    if filters:
+        cmd.extend(["-vf", ",".join(filters)])
+    cmd.extend([*codec_args, "-frames:v", "1", "-f", "null", "-"])
+    return subprocess.run(cmd, capture_output=True).returncode == 0
+
+
+def pick_hevc_encoder(choice: str = "auto") -> str:
+    """Pick the HEVC encoder: the requested one if usable, else the fastest available."""
+    if choice != "auto":
+        encoder = ENCODER_CHOICES[choice]
+        if encoder == "libx265" or encoder_works(encoder):
+            return encoder
+        print(f"  Warnung: Encoder '{encoder}' nicht verfügbar, wähle automatisch")
+    for encoder in HEVC_ENCODERS:
+        if encoder == "libx265" or encoder_works(encoder):
+            return encoder
+    return "libx265"
+
+
+def aac_encoder_args() -> list[str]:
+    """AAC audio arguments: AudioToolbox (aac_at) where ffmpeg has it (macOS), else the native encoder."""
+    if "aac_at" in available_encoders():
+        # Constrained VBR around the same 128k target; faster and better per bit than native aac
+        return ["-c:a", "aac_at", "-aac_at_mode", "cvbr", "-b:a", "128k"]
+    return ["-c:a", "aac", "-b:a", "128k"]
+
+
+@functools.lru_cache(maxsize=1)
+def available_hwaccels() -> frozenset[str]:
+    """Return the hardware decoding methods supported by the local ffmpeg (queried once)."""
+    try:
+        result = subprocess.run(
+            ["ffmpeg", "-hide_banner", "-hwaccels"],
+            capture_output=True, text=True
+        )
+    except FileNotFoundError:
+        return frozenset()
+    # First line is the "Hardware acceleration methods:" header
+    return frozenset(line.strip() for line in result.stdout.splitlines()[1:] if line.strip())
+
+
+@functools.lru_cache(maxsize=1)
+def available_filters() -> frozenset[str]:
+    """Return the filter names compiled into the local ffmpeg (queried once)."""
+    try:
+        result = subprocess.run(
+            ["ffmpeg", "-hide_banner", "-filters"],
+            capture_output=True, text=True
+        )
+    except FileNotFoundError:
+        return frozenset()
+    # Filter lines look like: " ... scale_cuda        V->V       GPU accelerated video resizer"
+    return frozenset(
+        parts[1] for line in result.stdout.splitlines()
+        if len(parts := line.split()) >= 3 and "->" in parts[2]
+    )
+
+
+def gpu_pipeline_args(encoder: str, width: int | None) -> tuple[list[str], list[str]] | None:
+    """Decode and scale on the GPU so frames stay in video memory until encoding.
+
+    Returns (input_args, filters), or None if the hwaccel or GPU scaler is missing.
+    """
+    hwaccels = available_hwaccels()
+    if encoder == "hevc_nvenc" and "cuda" in hwaccels:
+        input_args = ["-hwaccel", "cuda", "-hwaccel_output_format", "cuda"]
+        if not width:
+            return input_args, []
+        if "scale_cuda" in available_filters():
+            return input_args, [f"scale_cuda={width}:-2"]
+        if "scale_npp" in available_filters():
+            return input_args, [f"scale_npp={width}:-2"]
+    elif encoder == "hevc_vaapi" and "vaapi" in hwaccels:
+        input_args = ["-hwaccel", "vaapi", "-hwaccel_output_format", "vaapi", "-vaapi_device", VAAPI_DEVICE]
+        if not width:
+            return input_args, []
+        if "scale_vaapi" in available_filters():
+            return input_args, [f"scale_vaapi=w={width}:h=-2"]
+    elif encoder == "hevc_videotoolbox" and "videotoolbox" in hwaccels:
+        input_args = ["-hwaccel", "videotoolbox", "-hwaccel_output_format", "videotoolbox"]
+        if not width:
+            return input_args, []
+        if "scale_vt" in available_filters():
+            return input_args, [f"scale_vt=w={width}:h=-2"]
+    return None
+
+
+def build_compress_cmd(
+    input_path: Path,
+    output_path: Path,
+    encoder: str,
+    quality: int,
+    width: int | None,
+    gpu: tuple[list[str], list[str]] | None = None,
+    audio_path: Path = None,
+    threads: int = None,
+    classic_mp4: bool = False,
+    audio_copy: bool = False
+) -> tuple[list[str], str]:
+    """Build the ffmpeg compression command. Returns (cmd, mode_info).
+
+    With audio_path, the same ffmpeg run also writes a 16 kHz mono WAV for
+    Whisper, so the input is only demuxed and decoded once.
+    """
+    input_args, filters, codec_args, mode_info = hevc_encoder_args(encoder, quality, threads)
+    if gpu:
+        # GPU decode + scale replaces the CPU scaler and the upload to the encoder
+        input_args, filters = gpu
+        mode_info += ", GPU-Dekodierung"
+    elif width:
+        filters = [f"scale={width}:-2", *filters]
+
+    cmd = ["ffmpeg", *input_args, "-i", str(input_path)]
+    if filters:
+        cmd.extend(["-vf", ",".join(filters)])
+
+    # Video codec
+    cmd.extend(codec_args)
+
+    # Audio: AAC sources are stream-copied, everything else is re-encoded
+    if audio_copy:
+        cmd.extend(["-c:a", "copy"])
+    else:
+        cmd.extend(aac_encoder_args())
+
+    # Common settings
+    cmd.extend([
+        "-tag:v", "hvc1",
+        "-movflags", MOVFLAGS_CLASSIC if classic_mp4 else MOVFLAGS_FRAGMENTED,
+        "-y",
+        str(output_path)
+    ])
+
+    # Second output: audio for transcription (same format as transcribe.extract_audio)
+    if audio_path:
+        cmd.extend([
+            "-vn", "-acodec", "pcm_s16le",
+            "-ar", "16000", "-ac", "1",
+            str(audio_path)
+        ])
+    return cmd, mode_info
+
+
+def run_ffmpeg(cmd: list[str], duration: float, watchdog: bool = False) -> int | None:
+    """Run ffmpeg with a live progress line parsed from -progress output.
+
+    Returns the exit code, or None if the watchdog stopped a stalled encode
+    (speed below STALL_SPEED for STALL_SECONDS).
+    """
+    cmd = [cmd[0], "-hide_banner", "-loglevel", "warning", "-progress", "pipe:1", "-nostats", *cmd[1:]]
+    proc = subprocess.Popen(cmd, stdout=subprocess.PIPE, text=True, bufsize=1)
+
+    start = time.time()
+    slow_since = None
+    progress = {}
+    for line in proc.stdout:
+        key, _, value = line.strip().partition("=")
+        progress[key] = value
+        if key != "progress":
+            continue
+
+        # One progress block is complete
+        # out_time_us is newer; out_time_ms is misnamed and also holds microseconds
+        out_us = progress.get("out_time_us") or progress.get("out_time_ms") or "0"
+        out_time = int(out_us) / 1e6 if out_us.isdigit() else 0
+        pct = min(100, out_time / duration * 100) if duration else 0
+        speed = progress.get("speed", "").rstrip("x").strip()
+        fps = progress.get("fps", "0")
+        elapsed = time.time() - start
+        print(f"\r  [{pct:5.1f}%] {elapsed:.0f}s elapsed — {fps} fps, {speed or '?'}x", end="", flush=True)
+
+        if watchdog:
+            try:
+                slow = float(speed) < STALL_SPEED
+            except ValueError:
+                slow = False  # "N/A" while ffmpeg starts up
+            if not slow:
+                slow_since = None
+            elif slow_since is None:
+                slow_since = time.time()
+            elif time.time() - slow_since >= STALL_SECONDS:
+                proc.terminate()
+                proc.wait()
+                print()
+                return None
+
+    proc.wait()
+    print()
+    return proc.returncode
+
+
 def compress_video(
     input_path: Path,
     output_path: Path,
     quality: int = 50,
     scale: str = None,
-    max_compression: bool = False
+    max_compression: bool = False,
+    encoder: str = None,
+    audio_path: Path = None,
+    input_size: int = None,
+    threads: int = None,
+    classic_mp4: bool = False,
+    reencode: bool = False
 ) -> bool:
     """Compress video using H.265 encoder.
 
@@ -260,75 +704,82 @@ def compress_video(
         quality: Quality setting (0-100 for HW, ignored for max_compression)
         scale: Resolution preset ("1080p", "720p") or None for original
         max_compression: Use software encoder (libx265) for maximum compression
+        encoder: ffmpeg HEVC encoder name, or None to auto-detect
+        audio_path: Also extract transcription audio to this WAV in the same pass
+        input_size: Already known size of input_path in bytes (saves a stat)
+        threads: Thread cap for the software encoder (parallel jobs)
+        classic_mp4: Write a non-fragmented MP4 with +faststart (extra rewrite pass)
+        reencode: Re-encode HEVC sources instead of remuxing them
     """
     output_path.parent.mkdir(parents=True, exist_ok=True)
+    if input_size is None:
+        input_size = input_path.stat().st_size
+
+    if max_compression:
+        encoder = "libx265"
+    elif encoder is None:
+        encoder = pick_hevc_encoder()
 
     # Get video info for progress display
     info = get_video_info(input_path)
     duration_str = format_duration(info["duration"]) if info["duration"] else "unbekannt"
     resolution_str = f"{info['width']}x{info['height']}" if info["width"] else "unbekannt"
 
-    # Build ffmpeg command
-    cmd = ["ffmpeg", "-i", str(input_path)]
-
-    # Video filters (scaling)
-    vf_filters = []
+    width = None
     if scale:
-        scale_map = {
-            "1080p": "1920:-2",  # 1920 width, height proportional (divisible by 2)
-            "720p": "1280:-2",
-        }
-        if scale in scale_map:
-            vf_filters.append(f"scale={scale_map[scale]}")
-        else:
+        width = SCALE_WIDTHS.get(scale)
+        if not width:
             print(f"  Warnung: Unbekannte Skalierung '{scale}', überspringe")
 
-    if vf_filters:
-        cmd.extend(["-vf", ",".join(vf_filters)])
+    # A WAV output without an audio stream would make the whole ffmpeg run fail
+    if not info["has_audio"]:
+        audio_path = None
 
-    # Video codec
-    if max_compression:
-        # Software encoder: slower but better compression
-        cmd.extend([
-            "-c:v", "libx265",
-            "-crf", "28",
-            "-preset", "medium",
-        ])
-        mode_info = "Software (libx265, CRF 28)"
-    else:
-        # Hardware encoder: fast
-        cmd.extend([
-            "-c:v", "hevc_videotoolbox",
-            "-q:v", str(quality),
-        ])
-        mode_info = f"Hardware (VideoToolbox, q={quality})"
+    # Already HEVC and nothing to scale: remuxing is lossless and orders of magnitude faster
+    if not max_compression and not width and not reencode and info["video_codec"] == "hevc":
+        encoder = "copy"
 
-    # Common settings
-    cmd.extend([
-        "-tag:v", "hvc1",
-        "-c:a", "aac", "-b:a", "128k",
-        "-movflags", "+faststart",
-        "-y",
-        str(output_path)
-    ])
+    gpu = gpu_pipeline_args(encoder, width)
+    cmd_options = dict(
+        audio_path=audio_path,
+        threads=threads,
+        classic_mp4=classic_mp4,
+        audio_copy=info["audio_codec"] == "aac",
+    )
+    cmd, mode_info = build_compress_cmd(input_path, output_path, encoder, quality, width, gpu, **cmd_options)
 
     print(f"\n📹 KOMPRIMIERUNG")
     print(f"  Eingabe:    {input_path.name}")
     print(f"  Dauer:      {duration_str}")
     print(f"  Auflösung:  {resolution_str}")
-    print(f"  Größe:      {input_path.stat().st_size / 1e9:.2f} GB")
+    print(f"  Größe:      {input_size / 1e9:.2f} GB")
     print(f"  Modus:      {mode_info}")
+    if cmd_options["audio_copy"]:
+        print(f"  Ton:        AAC wird unverändert übernommen")
     if scale:
         print(f"  Skalierung: {scale}")
     print(f"  Ziel:       {output_path}")
+    if audio_path:
+        print(f"  Audio:      wird im selben Durchlauf für die Transkription extrahiert")
     print(f"  ⏳ Starte ffmpeg...")
 
-    result = subprocess.run(cmd)
-    if result.returncode != 0:
+    hardware = encoder not in ("libx265", "copy")
+    returncode = run_ffmpeg(cmd, info["duration"], watchdog=hardware)
+    if returncode and gpu:
+        # Hardware decoder can reject some inputs: retry with the CPU filter chain
+        print(f"  ⚠️  GPU-Dekodierung fehlgeschlagen, wiederhole mit CPU-Filtern...")
+        cmd, _ = build_compress_cmd(input_path, output_path, encoder, quality, width, **cmd_options)
+        returncode = run_ffmpeg(cmd, info["duration"], watchdog=hardware)
+    if returncode is None:
+        # Hardware encoder stalled: restart with the software encoder
+        print(f"  ⚠️  {encoder} hängt (<{STALL_SPEED}x für {STALL_SECONDS}s), wiederhole mit libx265...")
+        cmd, _ = build_compress_cmd(input_path, output_path, "libx265", quality, width, **cmd_options)
+        returncode = run_ffmpeg(cmd, info["duration"])
+    if returncode != 0:
         print(f"  ❌ FEHLER bei der Komprimierung")
         return False
 
-    in_size = input_path.stat().st_size
+    in_size = input_size
     out_size = output_path.stat().st_size
     ratio = in_size / out_size
     print(f"  ✅ Komprimierung abgeschlossen")
@@ -336,53 +787,72 @@ def compress_video(
     return True
 
 
-def transcribe_video(video_path: Path, output_dir: Path, hf_token: str = None, interactive: bool = False, no_diarize: bool = False) -> bool:
-    """Run transcription with speaker diarization on video."""
-    # Import from transcribe module
-    sys.path.insert(0, str(SCRIPT_DIR))
-    from transcribe import (
-        extract_audio, transcribe, diarize, assign_speakers,
-        prompt_speaker_names, apply_speaker_names, format_output,
-        auto_name_speakers
-    )
+def transcribe_video(
+    video_path: Path,
+    output_dir: Path,
+    hf_token: str = None,
+    interactive: bool = False,
+    no_diarize: bool = False,
+    precomputed_audio: Path = None
+) -> bool:
+    """Run transcription with speaker diarization on video.
+
+    If precomputed_audio points to a non-empty WAV (extracted during compression),
+    audio extraction is skipped. The caller owns that file.
+    """
+    if (tr := _transcribe_module()) is None:
+        print(f"\n🎙️ TRANSKRIPTION")
+        print(f"  ❌ Transkription nicht verfügbar: {_TRANSCRIBE_IMPORT_ERROR}")
+        return False
 
     transcript_path = output_dir / "transcript.txt"
 
     print(f"\n🎙️ TRANSKRIPTION")
     print(f"  Eingabe: {video_path.name}")
 
-    with tempfile.NamedTemporaryFile(suffix=".wav", delete=False) as tmp:
-        tmp_audio = Path(tmp.name)
+    owns_audio = not (precomputed_audio and _file_size(precomputed_audio) > 0)
+    if owns_audio:
+        tmp_audio = temp_wav_for(video_path)
+    else:
+        tmp_audio = precomputed_audio
 
     try:
-        print("  ⏳ Audio extrahieren...")
-        extract_audio(video_path, tmp_audio)
-        print("  ✅ Audio extrahiert")
-
-        print("  ⏳ Whisper Transkription (Modell: turbo, Sprache: de)...")
-        result = transcribe(tmp_audio, model_name="turbo", language="de")
+        if owns_audio:
+            print("  ⏳ Audio extrahieren...")
+            tr.extract_audio(video_path, tmp_audio)
+            print("  ✅ Audio extrahiert")
+        else:
+            print("  ✅ Audio bereits bei der Komprimierung extrahiert")
+
+        print(f"  ⏳ Whisper Transkription (Modell: {WHISPER_MODEL}, Sprache: de)...")
+        # Decoded once, shared by Whisper and pyannote
+        audio = tr.load_audio(tmp_audio)
+        # Hashed once for both result caches (transcript and speaker turns)
+        audio_digest = cache.file_digest(tmp_audio)
+        result = tr.transcribe(tmp_audio, model_name=WHISPER_MODEL, language="de", audio=audio,
+                               audio_digest=audio_digest)
         print(f"  ✅ Transkription abgeschlossen ({len(result['segments'])} Segmente)")
 
         if hf_token and not no_diarize:
             print("  ⏳ Sprecher-Diarisierung (pyannote)...")
-            speaker_turns = diarize(tmp_audio, hf_token)
-            assign_speakers(result["segments"], speaker_turns)
+            speaker_turns = tr.diarize(tmp_audio, hf_token, audio, audio_digest)
+            tr.assign_speakers(result["segments"], speaker_turns)
             print("  ✅ Sprecher-Erkennung abgeschlossen")
 
             if interactive:
                 # Interactive speaker naming
-                name_map = prompt_speaker_names(result["segments"])
+                name_map = tr.prompt_speaker_names(result["segments"])
             else:
                 # Auto-name speakers as Speaker-1, Speaker-2, etc.
-                name_map = auto_name_speakers(result["segments"])
+                name_map = tr.auto_name_speakers(result["segments"])
                 if name_map:
                     print(f"  Auto-benannt: {', '.join(name_map.values())}")
 
             if name_map:
-                apply_speaker_names(result["segments"], name_map)
+                tr.apply_speaker_names(result["segments"], name_map)
                 # Save speaker mapping to this recording's directory
                 speaker_file = output_dir / "speakers.json"
-                speaker_file.write_text(json.dumps(name_map, indent=2, ensure_ascii=False))
+                speaker_file.write_bytes(tr.dump_json(name_map))
                 print(f"     Sprecher: {', '.join(name_map.values())}")
                 print(f"     Gespeichert: {speaker_file.name}")
         elif no_diarize:
@@ -392,7 +862,7 @@ def transcribe_video(video_path: Path, output_dir: Path, hf_token: str = None, i
 
         did_diarize = bool(hf_token) and not no_diarize
         # Save transcript with timestamps
-        text = format_output(result["segments"], with_speakers=did_diarize, with_timestamps=True)
+        text = tr.format_output(result["segments"], with_speakers=did_diarize, with_timestamps=True)
         transcript_path.write_text(text, encoding="utf-8")
         print(f"  📝 Transkript gespeichert: {transcript_path.name}")
 
@@ -402,7 +872,8 @@ def transcribe_video(video_path: Path, output_dir: Path, hf_token: str = None, i
         print(f"  ❌ FEHLER bei Transkription: {e}")
         return False
     finally:
-        tmp_audio.unlink(missing_ok=True)
+        if owns_audio:
+            tmp_audio.unlink(missing_ok=True)
 
 
 def parse_transcript(transcript_path: Path) -> list[dict]:
@@ -415,7 +886,7 @@ def parse_transcript(transcript_path: Path) -> list[dict]:
 
     for line in content.split("\n"):
         # Match timestamp line: [MM:SS - MM:SS] or [HH:MM:SS - HH:MM:SS]
-        ts_match = re.match(r'\[(\d{1,2}:\d{2}(?::\d{2})?) - (\d{1,2}:\d{2}(?::\d{2})?)\]', line)
+        ts_match = _TRANSCRIPT_TS_RE.match(line)
         if ts_match:
             # Save previous segment
             if current_start is not None and current_text_lines:
@@ -452,12 +923,9 @@ def _parse_ts(ts: str) -> float:
 
 def diarize_existing(output_dir: Path, hf_token: str, interactive: bool = False) -> bool:
     """Add speaker diarization to an existing transcript (without re-running Whisper)."""
-    sys.path.insert(0, str(SCRIPT_DIR))
-    from transcribe import (
-        extract_audio, diarize, assign_speakers,
-        prompt_speaker_names, apply_speaker_names, format_output,
-        auto_name_speakers
-    )
+    if (tr := _transcribe_module()) is None:
+        print(f"  ❌ Sprecher-Diarisierung nicht verfügbar: {_TRANSCRIBE_IMPORT_ERROR}")
+        return False
 
     video_path = output_dir / "video.mp4"
     transcript_path = output_dir / "transcript.txt"
@@ -480,35 +948,34 @@ def diarize_existing(output_dir: Path, hf_token: str, interactive: bool = False)
         return False
     print(f"  📝 {len(segments)} Segmente aus Transkript gelesen")
 
-    with tempfile.NamedTemporaryFile(suffix=".wav", delete=False) as tmp:
-        tmp_audio = Path(tmp.name)
+    tmp_audio = temp_wav_for(video_path)
 
     try:
         print("  ⏳ Audio extrahieren...")
-        extract_audio(video_path, tmp_audio)
+        tr.extract_audio(video_path, tmp_audio)
         print("  ✅ Audio extrahiert")
 
         print("  ⏳ Sprecher-Diarisierung (pyannote)...")
-        speaker_turns = diarize(tmp_audio, hf_token)
-        assign_speakers(segments, speaker_turns)
+        speaker_turns = tr.diarize(tmp_audio, hf_token)
+        tr.assign_speakers(segments, speaker_turns)
         print("  ✅ Sprecher-Erkennung abgeschlossen")
 
         if interactive:
-            name_map = prompt_speaker_names(segments)
+            name_map = tr.prompt_speaker_names(segments)
         else:
-            name_map = auto_name_speakers(segments)
+            name_map = tr.auto_name_speakers(segments)
             if name_map:
                 print(f"  Auto-benannt: {', '.join(name_map.values())}")
 
         if name_map:
-            apply_speaker_names(segments, name_map)
+            tr.apply_speaker_names(segments, name_map)
             speaker_file = output_dir / "speakers.json"
-            speaker_file.write_text(json.dumps(name_map, indent=2, ensure_ascii=False))
+            speaker_file.write_bytes(tr.dump_json(name_map))
             print(f"     Sprecher: {', '.join(name_map.values())}")
             print(f"     Gespeichert: {speaker_file.name}")
 
         # Rewrite transcript with speaker labels
-        text = format_output(segments, with_speakers=True, with_timestamps=True)
+        text = tr.format_output(segments, with_speakers=True, with_timestamps=True)
         transcript_path.write_text(text, encoding="utf-8")
         print(f"  📝 Transkript aktualisiert: {transcript_path.name}")
 
@@ -530,36 +997,30 @@ def summarize_transcript(transcript_path: Path, output_dir: Path, api_key: str =
         # Still ohne Meldung - Benutzer kann manuell mit Claude Code zusammenfassen
         return False
 
-    try:
-        import anthropic
-    except ImportError:
+    if generate_summary is None:
         # anthropic nicht installiert - still überspringen
         return False
-
-    # Import from summarize module
-    sys.path.insert(0, str(SCRIPT_DIR))
-    from summarize import (
-        load_transcript, extract_timestamps_and_text,
-        generate_summary, generate_insights_with_timestamps
-    )
+    client = _get_anthropic_client(api_key)
 
     print("  Zusammenfassung generieren...")
 
     try:
         transcript = load_transcript(transcript_path)
-        segments = extract_timestamps_and_text(transcript)
-        client = anthropic.Anthropic(api_key=api_key)
+        segments = extract_timestamps_and_text(transcript, INSIGHTS_SEGMENTS)
 
-        output_parts = []
+        # Summary and insights are independent requests: run them concurrently
+        with ThreadPoolExecutor(max_workers=2) as pool:
+            summary_future = pool.submit(generate_summary, transcript, client, language="de")
+            insights_future = pool.submit(
+                generate_insights_with_timestamps, transcript, segments, client, language="de"
+            )
+            summary = summary_future.result()
+            insights = insights_future.result()
 
-        # Generate summary
-        summary = generate_summary(transcript, client, language="de")
+        output_parts = []
         output_parts.append("# Meeting-Zusammenfassung\n")
         output_parts.append(summary)
         output_parts.append("\n")
-
-        # Generate insights with timestamps
-        insights = generate_insights_with_timestamps(transcript, segments, client, language="de")
         output_parts.append("\n# Wichtige Punkte mit Zeitstempeln\n")
         output_parts.append(insights)
 
@@ -576,48 +1037,72 @@ def summarize_transcript(transcript_path: Path, output_dir: Path, api_key: str =
 
 
 def find_videos(input_dir: Path) -> list:
-    """Find all video files in input directory."""
-    videos = []
+    """Find all video files in input directory (single directory pass, case-insensitive)."""
     if not input_dir.exists():
-        return videos
-    for ext in VIDEO_EXTENSIONS:
-        videos.extend(input_dir.glob(f"*{ext}"))
-        videos.extend(input_dir.glob(f"*{ext.upper()}"))
+        return []
+    with os.scandir(input_dir) as entries:
+        videos = [
+            Path(e.path) for e in entries
+            if e.name.lower().endswith(_VIDEO_SUFFIXES) and e.is_file()
+        ]
     return sorted(videos)
 
 
-def find_output_dir(recording_name: str) -> Path | None:
+def resolve_jobs(requested: int, encoder: str) -> int:
+    """Determine how many videos to process in parallel.
+
+    0 means automatic (a quarter of the CPU cores). Hardware encoders are
+    capped at MAX_HW_JOBS, the software encoder by the per-job thread budget.
+    """
+    cpu_count = os.cpu_count() or 1
+    jobs = requested or max(1, cpu_count // 4)
+    if encoder == "libx265":
+        return max(1, min(cpu_count // FFMPEG_THREADS_PER_JOB, jobs))
+    return max(1, min(MAX_HW_JOBS, jobs))
+
+
+def list_output_dirs() -> list[str]:
+    """List the folder names in OUTPUT_DIR with a single directory read."""
+    if not OUTPUT_DIR.exists():
+        return []
+    with os.scandir(OUTPUT_DIR) as it:
+        return [e.name for e in it if e.is_dir()]
+
+
+def find_output_dir(recording_name: str, output_dirs: list[str] | None = None) -> Path | None:
     """Find the output directory for a recording, even if it was renamed.
 
     1. Direct match: converted/<recording_name>/video.mp4
     2. Search renamed folders by matching date/time prefix
+
+    output_dirs can be passed in (from list_output_dirs) so a batch scans
+    OUTPUT_DIR only once instead of once per video.
     """
+    if output_dirs is None:
+        output_dirs = list_output_dirs()
+
     # Direct match
-    direct = OUTPUT_DIR / recording_name
-    if direct.exists() and (direct / "video.mp4").exists():
-        return direct
+    if recording_name in output_dirs and (OUTPUT_DIR / recording_name / "video.mp4").exists():
+        return OUTPUT_DIR / recording_name
 
     # Try to match by date/time from the original name
     dt = parse_recording_datetime(recording_name)
-    if not dt and not OUTPUT_DIR.exists():
-        return None
-
-    if dt and OUTPUT_DIR.exists():
+    if dt:
         # Build prefix that renamed folders would start with
         prefix = dt.strftime("%Y-%m-%d_")
         time_part = dt.strftime("%H-%M")
-        for d in OUTPUT_DIR.iterdir():
-            if d.is_dir() and d.name.startswith(prefix) and time_part in d.name:
-                if (d / "video.mp4").exists():
-                    return d
+        for name in output_dirs:
+            if name.startswith(prefix) and time_part in name:
+                if (OUTPUT_DIR / name / "video.mp4").exists():
+                    return OUTPUT_DIR / name
 
     return None
 
 
-def is_already_processed(video_path: Path) -> bool:
+def is_already_processed(video_path: Path, output_dirs: list[str] | None = None) -> bool:
     """Check if video has been fully processed (video + transcript + renamed)."""
     recording_name = get_recording_name(video_path)
-    output_dir = find_output_dir(recording_name)
+    output_dir = find_output_dir(recording_name, output_dirs)
     if not output_dir:
         return False
     # Fully processed = video valid, transcript valid, AND folder was renamed
@@ -628,28 +1113,28 @@ def is_already_processed(video_path: Path) -> bool:
     )
 
 
-def process_video(
+# Deleting a multi-GB original can block for seconds on HDDs and network mounts;
+# do it in the background so the next video starts right away
+_cleanup_pool = ThreadPoolExecutor(max_workers=2)
+atexit.register(_cleanup_pool.shutdown, wait=True)
+
+
+def _prepare_job(
     input_path: Path,
     compress: bool = True,
     do_transcribe: bool = True,
     do_summarize: bool = True,
-    quality: int = 50,
-    scale: str = None,
-    max_compression: bool = False,
     delete_original: bool = True,
-    interactive: bool = False,
     no_diarize: bool = False
-) -> bool:
-    """Process a single video through the pipeline.
+) -> dict:
+    """Resolve the output paths for a video and print its header.
 
-    Supports resuming: each step checks if its output already exists and is valid.
-    If so, the step is skipped. This allows the pipeline to be interrupted and
-    resumed at any point.
+    Returns the per-video state shared by the pipeline stages.
     """
     # Determine output directory — check for existing (possibly renamed) dir first
-    input_path_resolved = input_path.resolve()
-    if not compress and OUTPUT_DIR.resolve() in input_path_resolved.parents:
+    if not compress and str(input_path.absolute()).startswith(_OUTPUT_PREFIXES):
         # transcribe-only mode: video is already in converted/
+        input_path_resolved = input_path.resolve()
         output_dir = input_path_resolved.parent
         recording_name = output_dir.name
         output_video = input_path_resolved
@@ -682,46 +1167,97 @@ def process_video(
 
     print(f"  Schritte: {' → '.join(steps)}")
 
-    # Step 1: Compress
-    if compress:
-        if is_video_valid(output_video):
-            in_size = input_path.stat().st_size
-            out_size = output_video.stat().st_size
-            print(f"\n📹 KOMPRIMIERUNG")
-            print(f"  ⏩ Übersprungen (video.mp4 existiert, {out_size/1e6:.0f} MB)")
-        else:
-            # Remove invalid/incomplete video before re-compressing
-            if output_video.exists():
-                output_video.unlink()
-            if not compress_video(input_path, output_video, quality, scale, max_compression):
-                return False
-
-    # Step 2: Transcribe
     transcript_path = output_dir / "transcript.txt"
-    if do_transcribe:
-        if is_transcript_valid(transcript_path):
-            print(f"\n🎙️ TRANSKRIPTION")
-            print(f"  ⏩ Übersprungen (transcript.txt existiert, {transcript_path.stat().st_size/1e3:.1f} KB)")
-        else:
-            video_to_transcribe = output_video if compress else input_path
-            hf_token = os.environ.get("HF_TOKEN")
-            if not transcribe_video(video_to_transcribe, output_dir, hf_token, interactive, no_diarize):
-                return False
+    video_done = compress and is_video_valid(output_video)
+
+    # When both compression and transcription run, extract the audio in the same ffmpeg pass
+    tmp_audio = None
+    if compress and not video_done and do_transcribe and not is_transcript_valid(transcript_path):
+        tmp_audio = temp_wav_for(input_path)
+
+    return {
+        "input_path": input_path,
+        "recording_name": recording_name,
+        "output_dir": output_dir,
+        "output_video": output_video,
+        "transcript_path": transcript_path,
+        "video_done": video_done,
+        "tmp_audio": tmp_audio,
+    }
+
+
+def _compress_step(
+    job: dict,
+    quality: int = 50,
+    scale: str = None,
+    max_compression: bool = False,
+    encoder: str = None,
+    known_size: int = None,
+    ffmpeg_threads: int = None,
+    classic_mp4: bool = False,
+    reencode: bool = False
+) -> bool:
+    """Step 1: compress the original into output_dir/video.mp4."""
+    output_video = job["output_video"]
+    if job["video_done"]:
+        out_size = output_video.stat().st_size
+        print(f"\n📹 KOMPRIMIERUNG")
+        print(f"  ⏩ Übersprungen (video.mp4 existiert, {out_size/1e6:.0f} MB)")
+        return True
+    # Remove invalid/incomplete video before re-compressing
+    if output_video.exists():
+        output_video.unlink()
+    return compress_video(job["input_path"], output_video, quality, scale, max_compression, encoder,
+                          job["tmp_audio"], input_size=known_size, threads=ffmpeg_threads,
+                          classic_mp4=classic_mp4, reencode=reencode)
+
+
+def _transcribe_step(job: dict, compress: bool = True, interactive: bool = False, no_diarize: bool = False) -> bool:
+    """Step 2: transcribe (and diarize) the video into output_dir/transcript.txt."""
+    transcript_path = job["transcript_path"]
+    if is_transcript_valid(transcript_path):
+        print(f"\n🎙️ TRANSKRIPTION")
+        print(f"  ⏩ Übersprungen (transcript.txt existiert, {transcript_path.stat().st_size/1e3:.1f} KB)")
+        return True
+    video_to_transcribe = job["output_video"] if compress else job["input_path"]
+    hf_token = os.environ.get("HF_TOKEN")
+    return transcribe_video(video_to_transcribe, job["output_dir"], hf_token, interactive, no_diarize,
+                            precomputed_audio=job["tmp_audio"])
+
+
+def _finish_step(
+    job: dict,
+    compress: bool = True,
+    do_transcribe: bool = True,
+    do_summarize: bool = True,
+    delete_original: bool = True
+) -> bool:
+    """Steps 3-5: summarize, rename the output folder and delete the original."""
+    input_path = job["input_path"]
+    recording_name = job["recording_name"]
+    output_dir = job["output_dir"]
+    transcript_path = job["transcript_path"]
 
     # Step 3: Summarize (optional - nur wenn ANTHROPIC_API_KEY gesetzt)
+    anthropic_key = os.environ.get("ANTHROPIC_API_KEY")
+    title_future = None
     if do_summarize and do_transcribe:
         if is_summary_valid(output_dir):
             print(f"\n📋 ZUSAMMENFASSUNG")
             print(f"  ⏩ Übersprungen (summary existiert)")
-        elif transcript_path.exists():
-            anthropic_key = os.environ.get("ANTHROPIC_API_KEY")
-            if anthropic_key:
+        elif transcript_path.exists() and anthropic_key:
+            with ThreadPoolExecutor(max_workers=1) as title_pool:
+                # The folder title is an independent Claude call: generate it alongside the summary
+                if parse_recording_datetime(recording_name):
+                    title_future = title_pool.submit(extract_title_from_transcript, transcript_path, anthropic_key)
                 summarize_transcript(transcript_path, output_dir, anthropic_key)
 
     # Step 4: Rename folder with descriptive name
     print(f"\n📁 UMBENENNUNG")
-    anthropic_key = os.environ.get("ANTHROPIC_API_KEY")
-    new_folder_name = generate_folder_name(recording_name, transcript_path, anthropic_key)
+    if title_future:
+        new_folder_name = generate_folder_name(recording_name, title=title_future.result())
+    else:
+        new_folder_name = generate_folder_name(recording_name, transcript_path, anthropic_key)
 
     if new_folder_name != output_dir.name:
         print(f"  Alt: {output_dir.name}")
@@ -737,8 +1273,8 @@ def process_video(
         if input_path.exists():
             print(f"\n🗑️ AUFRÄUMEN")
             print(f"  Lösche Original: {input_path.name}")
-            input_path.unlink()
-            print(f"  ✅ Gelöscht")
+            _cleanup_pool.submit(input_path.unlink, missing_ok=True)
+            print(f"  ✅ Löschen im Hintergrund gestartet")
         else:
             print(f"\n🗑️ AUFRÄUMEN")
             print(f"  ⏩ Übersprungen (Original bereits gelöscht)")
@@ -749,6 +1285,259 @@ def process_video(
     return True
 
 
+def process_video(
+    input_path: Path,
+    compress: bool = True,
+    do_transcribe: bool = True,
+    do_summarize: bool = True,
+    quality: int = 50,
+    scale: str = None,
+    max_compression: bool = False,
+    delete_original: bool = True,
+    interactive: bool = False,
+    no_diarize: bool = False,
+    encoder: str = None,
+    known_size: int = None,
+    ffmpeg_threads: int = None,
+    classic_mp4: bool = False,
+    reencode: bool = False
+) -> bool:
+    """Process a single video through the pipeline.
+
+    Supports resuming: each step checks if its output already exists and is valid.
+    If so, the step is skipped. This allows the pipeline to be interrupted and
+    resumed at any point.
+    """
+    job = _prepare_job(input_path, compress, do_transcribe, do_summarize, delete_original, no_diarize)
+    try:
+        if compress and not _compress_step(job, quality, scale, max_compression, encoder, known_size,
+                                           ffmpeg_threads, classic_mp4, reencode):
+            return False
+        if do_transcribe and not _transcribe_step(job, compress, interactive, no_diarize):
+            return False
+    finally:
+        if job["tmp_audio"]:
+            job["tmp_audio"].unlink(missing_ok=True)
+
+    return _finish_step(job, compress, do_transcribe, do_summarize, delete_original)
+
+
+# Pipeline mode: compress, transcribe and summarize run in their own thread, so
+# video k+1 is encoded while video k is transcribed and video k-1 is summarized.
+# The bounded queues keep at most two finished-but-unprocessed videos (and their
+# temporary WAVs) waiting between stages.
+PIPELINE_QUEUE_SIZE = 2
+# Queue waits wake up this often to check whether the pipeline is stopping
+PIPELINE_POLL_SECONDS = 0.5
+
+
+def _pipeline_put(q: queue.Queue, item, stop: threading.Event) -> bool:
+    """Hand item to the next stage; gives up (False) once the pipeline is stopping."""
+    while not stop.is_set():
+        try:
+            q.put(item, timeout=PIPELINE_POLL_SECONDS)
+            return True
+        except queue.Full:
+            continue
+    return False
+
+
+def _pipeline_get(q: queue.Queue, stop: threading.Event):
+    """Next item from the previous stage; None at its end or once the pipeline is stopping."""
+    while not stop.is_set():
+        try:
+            return q.get(timeout=PIPELINE_POLL_SECONDS)
+        except queue.Empty:
+            continue
+    return None
+
+
+def _discard_job(job: dict) -> None:
+    if job["tmp_audio"]:
+        job["tmp_audio"].unlink(missing_ok=True)
+
+
+def _compress_job(video: Path, known_size: int, opts: dict) -> dict | None:
+    """Prepare and compress one video. Returns the job dict, or None on failure.
+
+    Module-level so it can run in a ProcessPoolExecutor worker.
+    """
+    job = _prepare_job(video, opts["compress"], opts["do_transcribe"], opts["do_summarize"],
+                       opts["delete_original"], opts["no_diarize"])
+    try:
+        if _compress_step(job, opts["quality"], opts["scale"], opts["max_compression"], opts["encoder"],
+                          known_size, opts.get("ffmpeg_threads"), opts["classic_mp4"], opts["reencode"]):
+            return job
+    except BaseException:
+        # Also on Ctrl-C in an encode worker process: don't leave the WAV in /dev/shm
+        _discard_job(job)
+        raise
+    _discard_job(job)
+    return None
+
+
+def _compress_worker(videos: list[Path], sizes: dict, out_queue: queue.Queue, opts: dict,
+                     stop: threading.Event, jobs: int = 1) -> int:
+    """Stage 1: compress each video, hand successes to the transcribe stage.
+
+    With jobs > 1 the encodes run in a process pool and are handed on in
+    completion order; transcription stays a single consumer, since Whisper
+    instances would only compete for the same GPU.
+    """
+    failed = 0
+    try:
+        if jobs > 1:
+            with ProcessPoolExecutor(max_workers=jobs) as pool:
+                futures = {pool.submit(_compress_job, video, sizes[video], opts): video for video in videos}
+                for future in as_completed(futures):
+                    if stop.is_set():
+                        # Encodes that have not started yet are dropped; running ones finish
+                        for pending in futures:
+                            pending.cancel()
+                        break
+                    try:
+                        job = future.result()
+                    except Exception as e:
+                        print(f"  ❌ FEHLER bei {futures[future].name}: {e}")
+                        job = None
+                    if not job:
+                        failed += 1
+                    elif not _pipeline_put(out_queue, job, stop):
+                        _discard_job(job)
+        else:
+            for video in videos:
+                if stop.is_set():
+                    break
+                try:
+                    job = _compress_job(video, sizes[video], opts)
+                except Exception as e:
+                    print(f"  ❌ FEHLER bei {video.name}: {e}")
+                    job = None
+                if not job:
+                    failed += 1
+                elif not _pipeline_put(out_queue, job, stop):
+                    _discard_job(job)
+    except BaseException:
+        stop.set()
+        raise
+    finally:
+        _pipeline_put(out_queue, None, stop)
+    return failed
+
+
+def _transcribe_worker(in_queue: queue.Queue, out_queue: queue.Queue, opts: dict, stop: threading.Event,
+                       active: list) -> int:
+    """Stage 2: transcribe compressed videos, hand successes to the summarize stage.
+
+    active holds the job being transcribed, so an interrupted run can remove its WAV.
+    """
+    failed = 0
+    try:
+        # Load Whisper while the first video is still being compressed
+        if (tr := _transcribe_module()) is not None:
+            try:
+                tr.load_whisper(WHISPER_MODEL)
+            except Exception as e:
+                print(f"  ⚠️  Whisper Modell konnte nicht vorgeladen werden: {e}")
+        while (job := _pipeline_get(in_queue, stop)) is not None:
+            active.append(job)
+            try:
+                ok = _transcribe_step(job, opts["compress"], opts["interactive"], opts["no_diarize"])
+            except Exception as e:
+                print(f"  ❌ FEHLER bei {job['input_path'].name}: {e}")
+                ok = False
+            finally:
+                _discard_job(job)
+                active.clear()
+            if ok:
+                _pipeline_put(out_queue, job, stop)
+            else:
+                failed += 1
+    except BaseException:
+        stop.set()
+        raise
+    finally:
+        _pipeline_put(out_queue, None, stop)
+    return failed
+
+
+def _summarize_worker(in_queue: queue.Queue, opts: dict, stop: threading.Event) -> tuple[int, int]:
+    """Stage 3: summarize, rename and clean up transcribed videos."""
+    success = 0
+    failed = 0
+    try:
+        while (job := _pipeline_get(in_queue, stop)) is not None:
+            try:
+                ok = _finish_step(job, opts["compress"], opts["do_transcribe"], opts["do_summarize"],
+                                  opts["delete_original"])
+            except Exception as e:
+                print(f"  ❌ FEHLER bei {job['input_path'].name}: {e}")
+                ok = False
+            if ok:
+                success += 1
+            else:
+                failed += 1
+    except BaseException:
+        stop.set()
+        raise
+    return success, failed
+
+
+def _run_stage(target, *args) -> Future:
+    """Run a pipeline stage in a daemon thread.
+
+    On Ctrl-C run_pipeline re-raises at once, instead of joining a stage that
+    is in the middle of Whisper or a Claude stream (which ThreadPoolExecutor's
+    shutdown would do); main() then exits without waiting for the stages.
+    """
+    future = Future()
+
+    def run():
+        try:
+            future.set_result(target(*args))
+        except BaseException as e:
+            future.set_exception(e)
+
+    threading.Thread(target=run, daemon=True).start()
+    return future
+
+
+def run_pipeline(videos: list[Path], sizes: dict, opts: dict, jobs: int = 1) -> tuple[int, int]:
+    """Process a batch with the three stages overlapping. Returns (success, failed).
+
+    jobs is the number of parallel encodes in the compress stage. If a stage
+    dies, stop makes the other stages give up their queue waits; on Ctrl-C
+    the stages are abandoned mid-step (see _run_stage).
+    """
+    transcribe_queue = queue.Queue(maxsize=PIPELINE_QUEUE_SIZE)
+    summarize_queue = queue.Queue(maxsize=PIPELINE_QUEUE_SIZE)
+    stop = threading.Event()
+    active = []
+    try:
+        compress_future = _run_stage(_compress_worker, videos, sizes, transcribe_queue, opts, stop, jobs)
+        transcribe_future = _run_stage(_transcribe_worker, transcribe_queue, summarize_queue, opts, stop, active)
+        summarize_future = _run_stage(_summarize_worker, summarize_queue, opts, stop)
+        try:
+            success, failed = summarize_future.result()
+            failed += compress_future.result() + transcribe_future.result()
+        except BaseException:
+            # Ctrl-C or a crashed stage: release the other stages
+            stop.set()
+            raise
+    finally:
+        # Compressed videos still queued or being transcribed after a stop: remove their temporary WAVs
+        while True:
+            try:
+                job = transcribe_queue.get_nowait()
+            except queue.Empty:
+                break
+            if job:
+                _discard_job(job)
+        for job in active:
+            _discard_job(job)
+    return success, failed
+
+
 def main():
     parser = argparse.ArgumentParser(
         description="Video-Verarbeitungs-Pipeline: Komprimierung, Transkription, Sprecher-Erkennung, Zusammenfassung"
@@ -764,6 +1553,12 @@ def main():
                         help="Auflösung reduzieren (1080p=Full HD, 720p=HD)")
     parser.add_argument("--max-compression", action="store_true",
                         help="Software-Encoder (libx265) für maximale Kompression (langsamer)")
+    parser.add_argument("--encoder", choices=["auto", *ENCODER_CHOICES], default="auto",
+                        help="HEVC-Encoder: auto, nvenc, qsv, vaapi, vt (VideoToolbox), sw (libx265) (Standard: auto)")
+    parser.add_argument("--reencode", action="store_true",
+                        help="HEVC-Quellen neu kodieren statt nur umzupacken (Remux)")
+    parser.add_argument("--classic-mp4", action="store_true",
+                        help="Klassisches MP4 mit +faststart statt fragmentiertem MP4 (zusätzlicher Schreibdurchlauf)")
     parser.add_argument("--keep-originals", action="store_true",
                         help="Originale behalten (Standard: löschen)")
     parser.add_argument("--skip-processed", action="store_true",
@@ -778,6 +1573,8 @@ def main():
                         help="Interaktiv Sprecher-Namen eingeben (Standard: automatisch)")
     parser.add_argument("--resume", metavar="DIR",
                         help="Teilweise verarbeiteten Ordner in converted/ fortsetzen")
+    parser.add_argument("--jobs", type=int, default=1, metavar="N",
+                        help="Anzahl parallel verarbeiteter Videos (0=automatisch, Standard: 1)")
     args = parser.parse_args()
 
     # --diarize-only mode: add speaker diarization to existing transcript
@@ -842,7 +1639,8 @@ def main():
     # Filter already processed
     if args.skip_processed:
         original_count = len(videos)
-        videos = [v for v in videos if not is_already_processed(v)]
+        output_dirs = list_output_dirs()
+        videos = [v for v in videos if not is_already_processed(v, output_dirs)]
         skipped = original_count - len(videos)
         if skipped > 0:
             print(f"Überspringe {skipped} bereits verarbeitete Video(s)")
@@ -855,9 +1653,12 @@ def main():
     print(f"🎥 VIDEO-KONVERTIERUNGS-PIPELINE")
     print(f"{'='*60}")
     print(f"\nGefunden: {len(videos)} Video(s)")
+    # Stat all inputs concurrently (one round-trip each on network storage)
+    with ThreadPoolExecutor(max_workers=32) as ex:
+        sizes = dict(zip(videos, ex.map(lambda v: v.stat().st_size, videos)))
     total_size = 0
     for v in videos:
-        size_gb = v.stat().st_size / 1e9
+        size_gb = sizes[v] / 1e9
         total_size += size_gb
         print(f"  • {v.name} ({size_gb:.1f} GB)")
     if len(videos) > 1:
@@ -868,26 +1669,76 @@ def main():
     do_transcribe = not args.compress_only
     do_summarize = not args.no_summary
     delete_original = not args.keep_originals
+    encoder = None
+    if compress:
+        encoder = "libx265" if args.max_compression else pick_hevc_encoder(args.encoder)
 
     success = 0
     failed = 0
 
-    for video in videos:
-        if process_video(
-            video,
-            compress=compress,
-            do_transcribe=do_transcribe,
-            do_summarize=do_summarize,
-            quality=args.quality,
-            scale=args.scale,
-            max_compression=args.max_compression,
-            delete_original=delete_original,
-            interactive=args.interactive,
-            no_diarize=args.no_diarize
-        ):
-            success += 1
-        else:
-            failed += 1
+    video_kwargs = dict(
+        compress=compress,
+        do_transcribe=do_transcribe,
+        do_summarize=do_summarize,
+        quality=args.quality,
+        scale=args.scale,
+        max_compression=args.max_compression,
+        delete_original=delete_original,
+        interactive=args.interactive,
+        no_diarize=args.no_diarize,
+        encoder=encoder,
+        classic_mp4=args.classic_mp4,
+        reencode=args.reencode
+    )
+
+    # Interactive speaker naming needs the terminal, so it always runs sequentially
+    jobs = 1 if args.interactive else resolve_jobs(args.jobs, encoder)
+    jobs = min(jobs, len(videos))
+    if jobs > 1 and do_transcribe and not compress:
+        # Nothing to encode in parallel; one Whisper/pyannote per worker would only compete for the GPU
+        print("\n  ℹ️  --jobs ignoriert: ohne Komprimierung wird nacheinander transkribiert")
+        jobs = 1
+
+    if jobs > 1 and encoder == "libx265":
+        # Several medium-threaded encoders keep the cores busier than one saturated process
+        video_kwargs["ffmpeg_threads"] = max(2, (os.cpu_count() or 1) // jobs)
+
+    if compress and do_transcribe and not args.interactive and len(videos) > 1:
+        if jobs > 1:
+            print(f"\n  ⚡ Parallele Komprimierung: {jobs} Videos gleichzeitig")
+        print(f"\n  ⚡ Pipeline: Komprimierung, Transkription und Zusammenfassung laufen überlappend")
+        try:
+            success, failed = run_pipeline(videos, sizes, video_kwargs, jobs)
+        except KeyboardInterrupt:
+            # The stage threads may be inside Whisper or a Claude stream, some with thread pools
+            # the interpreter would join at exit: leave without waiting for them
+            print("\n\n  ⛔ Abgebrochen")
+            sys.stdout.flush()
+            _cleanup_pool.shutdown(wait=True)
+            os._exit(130)
+    elif jobs > 1:
+        print(f"\n  ⚡ Parallele Verarbeitung: {jobs} Videos gleichzeitig")
+        with ProcessPoolExecutor(max_workers=jobs) as pool:
+            futures = {
+                pool.submit(process_video, video, known_size=sizes[video], **video_kwargs): video
+                for video in videos
+            }
+            for future in as_completed(futures):
+                try:
+                    ok = future.result()
+                except Exception as e:
+                    print(f"  ❌ FEHLER bei {futures[future].name}: {e}")
+                    ok = False
+                if ok:
+                    success += 1
+                else:
+                    failed += 1
+    else:
+        for video in videos:
+            if process_video(video, known_size=sizes[video], **video_kwargs):
+                success += 1
+            else:
+                failed += 1
 
     print(f"\n{'='*60}")
     if failed == 0:
@@ -4,71 +4,84 @@
 import argparse
 import re
 import sys
+from dataclasses import dataclass, field
 from pathlib import Path
 
 # Regex patterns for parsing transcript
 # New format: [00:05:12 - 00:05:30] [Speaker-1]
 TIMESTAMPED_HEADER = re.compile(
-    r'\[(\d{2}:\d{2}(?::\d{2})?) - (\d{2}:\d{2}(?::\d{2})?)\]\s*\[([^\]]+)\]'
+    r'\[(\d{2}:\d{2}(?::\d{2})?+) - (\d{2}:\d{2}(?::\d{2})?+)\]\s*\[([^\]]+)\]'
 )
 # Timestamp only: [00:05:12 - 00:05:30]
 TIMESTAMP_ONLY = re.compile(
-    r'\[(\d{2}:\d{2}(?::\d{2})?) - (\d{2}:\d{2}(?::\d{2})?)\]$'
+    r'\[(\d{2}:\d{2}(?::\d{2})?+) - (\d{2}:\d{2}(?::\d{2})?+)\]$'
 )
 # Legacy format: [Speaker-1]
 SPEAKER_ONLY = re.compile(r'^\[([^\]]+)\]$')
 
+# Bound match methods: parse_transcript calls these once per header line
+_match_timestamped_header = TIMESTAMPED_HEADER.match
+_match_timestamp_only = TIMESTAMP_ONLY.match
+_match_speaker_only = SPEAKER_ONLY.match
 
-def parse_transcript(content: str) -> list[dict]:
+
+@dataclass(slots=True)
+class Segment:
+    """One transcript block: optional time range, speaker and its text lines."""
+    start: str | None = None
+    end: str | None = None
+    speaker: str | None = None
+    text: list[str] = field(default_factory=list)
+
+
+def parse_transcript(content: str) -> list[Segment]:
     """Parse transcript into structured segments."""
     segments = []
     current_segment = None
 
-    for line in content.split('\n'):
-        line_stripped = line.strip()
+    for line_stripped in content.splitlines():
+        # Most lines have no surrounding whitespace; only those pay for a strip()
+        if line_stripped and (line_stripped[0].isspace() or line_stripped[-1].isspace()):
+            line_stripped = line_stripped.strip()
         if not line_stripped:
             continue
 
+        # Headers always start with '[' - plain text lines skip the regexes
+        if line_stripped[0] != '[':
+            if current_segment:
+                current_segment.text.append(line_stripped)
+            continue
+
         # Check for timestamped header with speaker
-        match = TIMESTAMPED_HEADER.match(line_stripped)
+        match = _match_timestamped_header(line_stripped)
         if match:
             if current_segment:
                 segments.append(current_segment)
-            current_segment = {
-                'start': match.group(1),
-                'end': match.group(2),
-                'speaker': match.group(3),
-                'text': []
-            }
+            current_segment = Segment(match.group(1), match.group(2), match.group(3))
             continue
 
         # Check for timestamp only (no speaker change)
-        match = TIMESTAMP_ONLY.match(line_stripped)
+        match = _match_timestamp_only(line_stripped)
         if match:
             if current_segment:
                 segments.append(current_segment)
-            current_segment = {
-                'start': match.group(1),
-                'end': match.group(2),
-                'speaker': current_segment.get('speaker') if current_segment else 'Unknown',
-                'text': []
-            }
+            current_segment = Segment(
+                match.group(1), match.group(2),
+                current_segment.speaker if current_segment else 'Unknown'
+            )
             continue
 
         # Check for speaker-only header (legacy format)
-        match = SPEAKER_ONLY.match(line_stripped)
+        match = _match_speaker_only(line_stripped)
         if match:
             if current_segment:
                 segments.append(current_segment)
-            current_segment = {
-                'speaker': match.group(1),
-                'text': []
-            }
+            current_segment = Segment(speaker=match.group(1))
             continue
 
         # Regular text line
         if current_segment:
-            current_segment['text'].append(line_stripped)
+            current_segment.text.append(line_stripped)
 
     if current_segment:
         segments.append(current_segment)
@@ -76,15 +89,19 @@ def parse_transcript(content: str) -> list[dict]:
     return segments
 
 
-def collect_speaker_samples(segments: list[dict]) -> dict[str, str]:
+def collect_speaker_samples(segments: list[Segment]) -> dict[str, str]:
     """Get first substantial quote from each speaker."""
+    speakers = {seg.speaker for seg in segments}
     samples = {}
     for seg in segments:
-        speaker = seg.get('speaker', 'Unknown')
+        speaker = seg.speaker
         if speaker not in samples:
-            text = ' '.join(seg['text'])
+            text = ' '.join(seg.text)
             if len(text) > 10:
                 samples[speaker] = text[:150]
+                # Every speaker has a quote: stop scanning
+                if len(samples) == len(speakers):
+                    break
     return samples
 
 
@@ -106,37 +123,47 @@ def prompt_rename(samples: dict[str, str]) -> dict[str, str]:
     return name_map
 
 
-def apply_rename(segments: list[dict], name_map: dict[str, str]) -> None:
+def apply_rename(segments: list[Segment], name_map: dict[str, str]) -> None:
     """Apply name mappings to segments."""
     for seg in segments:
-        old_name = seg.get('speaker')
-        if old_name in name_map:
-            seg['speaker'] = name_map[old_name]
+        new_name = name_map.get(seg.speaker)
+        if new_name is not None:
+            seg.speaker = new_name
 
 
-def format_transcript(segments: list[dict]) -> str:
-    """Reconstruct transcript from segments."""
-    lines = []
-    current_speaker = None
+def write_transcript(segments: list[Segment], path: Path) -> None:
+    """Reconstruct transcript from segments and write it to path.
 
-    for seg in segments:
-        header_parts = []
+    Lines are encoded and written one at a time instead of joining the
+    whole transcript into a single string first.
+    """
+    current_speaker = None
+    started = False
 
-        if 'start' in seg and 'end' in seg:
-            header_parts.append(f"[{seg['start']} - {seg['end']}]")
+    with open(path, 'wb', buffering=1 << 20) as f:
+        for seg in segments:
+            header_parts = []
 
-        speaker = seg.get('speaker')
-        if speaker and speaker != current_speaker:
-            current_speaker = speaker
-            header_parts.append(f"[{speaker}]")
+            if seg.start is not None and seg.end is not None:
+                header_parts.append(f"[{seg.start} - {seg.end}]")
 
-        if header_parts:
-            lines.append("\n" + " ".join(header_parts))
+            speaker = seg.speaker
+            if speaker and speaker != current_speaker:
+                current_speaker = speaker
+                header_parts.append(f"[{speaker}]")
 
-        for text_line in seg['text']:
-            lines.append(text_line)
+            # Headers are preceded by a blank line, except at the top of the file
+            if header_parts:
+                if started:
+                    f.write(b"\n\n")
+                f.write(" ".join(header_parts).encode("utf-8"))
+                started = True
 
-    return "\n".join(lines).strip()
+            for text_line in seg.text:
+                if started:
+                    f.write(b"\n")
+                f.write(text_line.encode("utf-8"))
+                started = True
 
 
 def main():
@@ -172,7 +199,7 @@ Beispiele:
         sys.exit("Keine Segmente im Transkript gefunden")
 
     # Get unique speakers
-    speakers = set(seg.get('speaker') for seg in segments if seg.get('speaker'))
+    speakers = set(seg.speaker for seg in segments if seg.speaker)
     print(f"Gefundene Speaker: {', '.join(sorted(speakers))}")
 
     # Get name mappings
@@ -190,8 +217,7 @@ Beispiele:
     apply_rename(segments, name_map)
     output_path = Path(args.output) if args.output else transcript_path
 
-    new_content = format_transcript(segments)
-    output_path.write_text(new_content, encoding="utf-8")
+    write_transcript(segments, output_path)
 
     print(f"\nTranskript aktualisiert: {output_path}")
     for old, new in name_map.items():
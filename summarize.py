@@ -2,15 +2,36 @@
 """Generate summary and insights from transcript using Claude API."""
 
 import argparse
+import itertools
+import json
 import os
 import re
 import sys
+import time
+from collections.abc import Iterator
+from concurrent.futures import ThreadPoolExecutor
 from pathlib import Path
 
 import anthropic
 
+import cache
+
 
 DEFAULT_MODEL = "claude-sonnet-4-20250514"
+# Message Batches are billed at half price but finish asynchronously
+BATCH_POLL_SECONDS = 15
+# The insights prompt references only the first segments
+INSIGHTS_SEGMENTS = 50
+# Longer transcripts are summarized per chunk first (~15 minutes of speech each)
+CHUNK_CHARS = 24_000
+# Concurrent streams for the chunk summaries with --sync
+SYNC_WORKERS = 4
+
+# Segment header: [00:05:12 - 00:05:30] (optionally followed by [Speaker]).
+# Possessive ?+ (Python 3.11+): the optional third field is never backtracked into
+_TS_PATTERN = re.compile(
+    r'\[(\d{2}:\d{2}(?::\d{2})?+) - (\d{2}:\d{2}(?::\d{2})?+)\]'
+)
 
 
 def load_transcript(transcript_path: Path) -> str:
@@ -18,13 +39,14 @@ def load_transcript(transcript_path: Path) -> str:
     return transcript_path.read_text(encoding="utf-8")
 
 
-def extract_timestamps_and_text(content: str) -> list[dict]:
-    """Parse transcript to extract timestamps with text for insights."""
-    pattern = re.compile(
-        r'\[(\d{2}:\d{2}(?::\d{2})?) - (\d{2}:\d{2}(?::\d{2})?)\]'
-    )
+def _close_segment(segment: dict) -> dict:
+    # Join once; the leading space matches the former ' ' + line accumulation
+    segment['text'] = ' ' + ' '.join(segment.pop('parts'))
+    return segment
+
 
-    segments = []
+def iter_segments(content: str) -> Iterator[dict]:
+    """Yield timestamped segments from a transcript, each as soon as it is complete."""
     current_segment = None
 
     for line in content.split('\n'):
@@ -32,31 +54,91 @@ def extract_timestamps_and_text(content: str) -> list[dict]:
         if not line:
             continue
 
-        match = pattern.match(line)
-        if match:
-            if current_segment and current_segment['text']:
-                segments.append(current_segment)
+        # Text lines never start with '[': skip the regex for them
+        if line[0] != '[':
+            if current_segment:
+                current_segment['parts'].append(line)
+        elif match := _TS_PATTERN.match(line):
+            if current_segment and current_segment['parts']:
+                yield _close_segment(current_segment)
             current_segment = {
                 'start': match.group(1),
                 'end': match.group(2),
-                'text': ''
+                'parts': []
             }
-        elif current_segment and not line.startswith('['):
-            current_segment['text'] += ' ' + line
 
-    if current_segment and current_segment['text']:
-        segments.append(current_segment)
+    if current_segment and current_segment['parts']:
+        yield _close_segment(current_segment)
 
-    return segments
 
+def extract_timestamps_and_text(content: str, limit: int | None = None) -> list[dict]:
+    """Parse transcript to extract timestamps with text for insights.
 
-def generate_summary(
-    transcript: str,
-    client: anthropic.Anthropic,
+    With limit, parsing stops after that many segments.
+    """
+    return list(itertools.islice(iter_segments(content), limit))
+
+
+def chunk_transcript(content: str, max_chars: int = CHUNK_CHARS) -> list[str]:
+    """Split a transcript into chunks of about max_chars, cutting only at segment headers."""
+    chunks = []
+    current = []
+    size = 0
+    for line in content.splitlines(keepends=True):
+        if size >= max_chars and line[:1] == '[' and _TS_PATTERN.match(line):
+            chunks.append(''.join(current).strip())
+            current, size = [], 0
+        current.append(line)
+        size += len(line)
+    chunks.append(''.join(current).strip())
+    return [chunk for chunk in chunks if chunk]
+
+
+def chunk_request(
+    chunk: str,
+    index: int,
+    total: int,
     model: str = DEFAULT_MODEL,
     language: str = "de"
-) -> str:
-    """Generate a summary of the transcript."""
+) -> dict:
+    """Build the Messages API parameters for the summary of one transcript chunk."""
+
+    lang_instruction = {
+        "de": "Antworte auf Deutsch.",
+        "en": "Respond in English."
+    }.get(language, "Respond in the same language as the transcript.")
+
+    prompt = f"""Dies ist Abschnitt {index + 1} von {total} eines Meeting-Transkripts.
+
+Fasse den Abschnitt stichpunktartig zusammen:
+- Besprochene Themen (mit Zeitstempel)
+- Getroffene Entscheidungen
+- Offene Fragen, Aktionspunkte und vereinbarte naechste Schritte
+- Wer was beigetragen hat (soweit Sprecher erkennbar)
+
+{lang_instruction}
+
+---
+TRANSKRIPT-ABSCHNITT:
+{chunk}
+"""
+
+    return {
+        "model": model,
+        "max_tokens": 1000,
+        "messages": [
+            {"role": "user", "content": prompt}
+        ]
+    }
+
+
+def summary_request(
+    transcript: str,
+    model: str = DEFAULT_MODEL,
+    language: str = "de",
+    heading: str = "TRANSKRIPT"
+) -> dict:
+    """Build the Messages API parameters for the summary."""
 
     lang_instruction = {
         "de": "Antworte auf Deutsch.",
@@ -79,34 +161,92 @@ def generate_summary(
 {lang_instruction}
 
 ---
-TRANSKRIPT:
+{heading}:
 {transcript}
 """
 
-    message = client.messages.create(
-        model=model,
-        max_tokens=2000,
-        messages=[
+    return {
+        "model": model,
+        "max_tokens": 2000,
+        "messages": [
             {"role": "user", "content": prompt}
         ]
+    }
+
+
+def request_key(params: dict) -> str:
+    """Cache key for a request: covers model, limits and the full prompt (transcript + language)."""
+    return cache.text_digest(json.dumps(params, sort_keys=True, ensure_ascii=False))
+
+
+def complete(client: anthropic.Anthropic, params: dict, section: str) -> str:
+    """Run one Messages API request, answering from the result cache if possible."""
+    key = request_key(params)
+    if (text := cache.load_text(key, f"{section}.txt")) is not None:
+        return text
+    # Streamed: tokens arrive while they are generated and the connection never sits idle
+    with client.messages.stream(**params) as stream:
+        text = "".join(stream.text_stream)
+    cache.save_text(key, f"{section}.txt", text)
+    return text
+
+
+def summary_requests(
+    transcript: str,
+    model: str = DEFAULT_MODEL,
+    language: str = "de",
+    single_shot: bool = False
+) -> dict[str, dict]:
+    """Requests for the summary: one "summary" request, or one "chunk-N" per chunk (map phase)."""
+    chunks = [transcript] if single_shot else chunk_transcript(transcript)
+    if len(chunks) <= 1:
+        return {"summary": summary_request(transcript, model, language)}
+    return {
+        f"chunk-{i}": chunk_request(chunk, i, len(chunks), model, language)
+        for i, chunk in enumerate(chunks)
+    }
+
+
+def reduce_request(
+    partials: list[str],
+    model: str = DEFAULT_MODEL,
+    language: str = "de"
+) -> dict:
+    """Build the final summary request over the chunk summaries (reduce phase)."""
+    return summary_request(
+        "\n\n".join(partials), model, language,
+        heading="TEILZUSAMMENFASSUNGEN DES TRANSKRIPTS (chronologisch)"
     )
 
-    return message.content[0].text
 
+def generate_summary(
+    transcript: str,
+    client: anthropic.Anthropic,
+    model: str = DEFAULT_MODEL,
+    language: str = "de",
+    single_shot: bool = False
+) -> str:
+    """Generate a summary of the transcript (map-reduce over chunks if it is long)."""
+    requests = summary_requests(transcript, model, language, single_shot)
+    if "summary" in requests:
+        return complete(client, requests["summary"], "summary")
+    with ThreadPoolExecutor(max_workers=min(len(requests), SYNC_WORKERS)) as pool:
+        partials = list(pool.map(complete, itertools.repeat(client), requests.values(), requests.keys()))
+    return complete(client, reduce_request(partials, model, language), "summary")
 
-def generate_insights_with_timestamps(
+
+def insights_request(
     transcript: str,
     segments: list[dict],
-    client: anthropic.Anthropic,
     model: str = DEFAULT_MODEL,
     language: str = "de"
-) -> str:
-    """Generate key insights with timestamps."""
+) -> dict:
+    """Build the Messages API parameters for the timestamped insights."""
 
     # Create a condensed version with timestamps for reference
     timestamped_reference = "\n".join([
         f"[{seg['start']}] {seg['text'][:200]}..."
-        for seg in segments[:50]  # Limit to avoid token overflow
+        for seg in segments[:INSIGHTS_SEGMENTS]  # Limit to avoid token overflow
     ])
 
     lang_instruction = {
@@ -141,15 +281,68 @@ VOLLSTAENDIGES TRANSKRIPT (erste 15000 Zeichen):
 {transcript[:15000]}
 """
 
-    message = client.messages.create(
-        model=model,
-        max_tokens=1500,
-        messages=[
+    return {
+        "model": model,
+        "max_tokens": 1500,
+        "messages": [
             {"role": "user", "content": prompt}
         ]
-    )
+    }
+
 
-    return message.content[0].text
+def generate_insights_with_timestamps(
+    transcript: str,
+    segments: list[dict],
+    client: anthropic.Anthropic,
+    model: str = DEFAULT_MODEL,
+    language: str = "de"
+) -> str:
+    """Generate key insights with timestamps."""
+    return complete(client, insights_request(transcript, segments, model, language), "insights")
+
+
+def run_batch(requests: dict[str, dict], client: anthropic.Anthropic) -> dict[str, str]:
+    """Submit requests (custom_id -> params) as one Message Batch and wait for the texts."""
+    batch = client.messages.batches.create(
+        requests=[{"custom_id": custom_id, "params": params} for custom_id, params in requests.items()]
+    )
+    print(f"Batch {batch.id} eingereicht, warte auf Ergebnis (kann dauern, --sync fuer sofortige Antwort)...")
+    while batch.processing_status != "ended":
+        time.sleep(BATCH_POLL_SECONDS)
+        batch = client.messages.batches.retrieve(batch.id)
+
+    texts = {}
+    for entry in client.messages.batches.results(batch.id):
+        if entry.result.type != "succeeded":
+            raise RuntimeError(f"Batch-Anfrage '{entry.custom_id}' fehlgeschlagen: {entry.result.type}")
+        texts[entry.custom_id] = entry.result.message.content[0].text
+        cache.save_text(request_key(requests[entry.custom_id]), f"{entry.custom_id}.txt", texts[entry.custom_id])
+    return texts
+
+
+def run_requests(requests: dict[str, dict], client: anthropic.Anthropic, sync: bool) -> dict[str, str]:
+    """Answer requests (custom_id -> params) from the cache, the rest directly (sync) or as one batch."""
+    texts = {}
+    pending = {}
+    for custom_id, params in requests.items():
+        # Unchanged transcript/model/language: answer from the cache
+        if (cached := cache.load_text(request_key(params), f"{custom_id}.txt")) is not None:
+            print(f"Aus Cache: {custom_id}")
+            texts[custom_id] = cached
+        else:
+            pending[custom_id] = params
+
+    if sync and pending:
+        # Independent requests: stream them at the same time
+        with ThreadPoolExecutor(max_workers=min(len(pending), SYNC_WORKERS)) as pool:
+            futures = {
+                custom_id: pool.submit(complete, client, params, custom_id)
+                for custom_id, params in pending.items()
+            }
+            texts.update((custom_id, future.result()) for custom_id, future in futures.items())
+    elif pending:
+        texts.update(run_batch(pending, client))
+    return texts
 
 
 def main():
@@ -168,6 +361,10 @@ def main():
                         help="Nur Erkenntnisse mit Timestamps generieren")
     parser.add_argument("--summary-only", action="store_true",
                         help="Nur Zusammenfassung generieren")
+    parser.add_argument("--sync", action="store_true",
+                        help="Direkte API-Aufrufe statt Message Batch (sofortiges Ergebnis, doppelter Preis)")
+    parser.add_argument("--single-shot", action="store_true",
+                        help="Zusammenfassung in einem Aufruf statt abschnittsweise (nur fuer kurze Transkripte)")
     args = parser.parse_args()
 
     if not args.api_key:
@@ -181,32 +378,53 @@ def main():
 
     print(f"Lade Transkript: {transcript_path}")
     transcript = load_transcript(transcript_path)
-    segments = extract_timestamps_and_text(transcript)
+    segments = extract_timestamps_and_text(transcript, INSIGHTS_SEGMENTS)
 
     client = anthropic.Anthropic(api_key=args.api_key)
 
+    requests = {}
+    if not args.insights_only:
+        requests.update(summary_requests(transcript, args.model, args.language, args.single_shot))
+    if not args.summary_only:
+        requests["insights"] = insights_request(transcript, segments, args.model, args.language)
+    chunk_ids = [custom_id for custom_id in requests if custom_id.startswith("chunk-")]
+
+    mode = "" if args.sync else " (Message Batch)"
+    if chunk_ids:
+        print(f"Generiere Zusammenfassung in {len(chunk_ids)} Abschnitten und Erkenntnisse{mode}...")
+    else:
+        print(f"Generiere Zusammenfassung und Erkenntnisse{mode}...")
+    try:
+        texts = run_requests(requests, client, args.sync)
+        if chunk_ids:
+            # Reduce phase: one summary over the chunk summaries
+            print(f"Fasse Abschnitte zusammen{mode}...")
+            partials = [texts.pop(custom_id) for custom_id in chunk_ids]
+            reduce = reduce_request(partials, args.model, args.language)
+            texts.update(run_requests({"summary": reduce}, client, args.sync))
+    except RuntimeError as e:
+        sys.exit(str(e))
+
     output_parts = []
 
-    # Generate summary
-    if not args.insights_only:
-        print("Generiere Zusammenfassung...")
-        summary = generate_summary(transcript, client, args.model, args.language)
+    # Summary
+    if "summary" in texts:
         output_parts.append("# Meeting-Zusammenfassung\n")
-        output_parts.append(summary)
+        output_parts.append(texts["summary"])
         output_parts.append("\n")
 
-    # Generate insights with timestamps
-    if not args.summary_only:
-        print("Generiere Erkenntnisse mit Timestamps...")
-        insights = generate_insights_with_timestamps(
-            transcript, segments, client, args.model, args.language
-        )
+    # Insights with timestamps
+    if "insights" in texts:
         output_parts.append("\n# Wichtige Punkte mit Zeitstempeln\n")
-        output_parts.append(insights)
+        output_parts.append(texts["insights"])
 
     # Write output
     summary_path = output_dir / "summary.txt"
-    summary_path.write_text("\n".join(output_parts), encoding="utf-8")
+    with summary_path.open("w", encoding="utf-8") as f:
+        for i, part in enumerate(output_parts):
+            if i:
+                f.write("\n")
+            f.write(part)
     print(f"\nZusammenfassung gespeichert: {summary_path}")
 
 
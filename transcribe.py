@@ -2,19 +2,57 @@
 """Extract audio from video files and transcribe using Whisper with speaker diarization."""
 
 import argparse
+import bisect
+import contextlib
+import functools
+import itertools
 import json
 import os
 import shutil
 import subprocess
 import sys
 import tempfile
+import threading
 import time
+import wave
+from concurrent.futures import ProcessPoolExecutor, ThreadPoolExecutor
 from pathlib import Path
 
+import numpy as np
 import torch
-import whisper
 from pyannote.audio import Pipeline
 
+import cache
+
+# Whisper backends: faster-whisper (CTranslate2, int8) is preferred when installed,
+# openai-whisper is the fallback
+try:
+    from faster_whisper import WhisperModel
+except ImportError:
+    WhisperModel = None
+try:
+    import whisper
+except ImportError:
+    if WhisperModel is None:
+        raise
+    whisper = None
+try:
+    import orjson
+except ImportError:
+    orjson = None
+
+# Whisper's and pyannote's native input format (what extract_audio writes)
+SAMPLE_RATE = 16000
+
+# faster-whisper names for openai-whisper model aliases
+FASTER_WHISPER_MODELS = {"turbo": "large-v3-turbo"}
+
+# Also part of the diarization cache key: a different model means new turns
+DIARIZATION_MODEL = "pyannote/speaker-diarization-3.1"
+
+# _patched_torch_load() swaps out torch.load; model loads in other threads must wait
+_TORCH_LOAD_LOCK = threading.Lock()
+
 
 def extract_audio(video_path: Path, audio_path: Path) -> None:
     subprocess.run(
@@ -25,6 +63,22 @@ def extract_audio(video_path: Path, audio_path: Path) -> None:
     )
 
 
+def load_audio(audio_path: Path) -> np.ndarray | None:
+    """Decode a 16 kHz mono 16-bit WAV into float32 samples in [-1, 1).
+
+    Returns None for any other format; callers then pass the path and let
+    the models decode it themselves.
+    """
+    try:
+        with wave.open(str(audio_path), "rb") as w:
+            if w.getframerate() != SAMPLE_RATE or w.getnchannels() != 1 or w.getsampwidth() != 2:
+                return None
+            frames = w.readframes(w.getnframes())
+    except (wave.Error, EOFError):
+        return None
+    return np.frombuffer(frames, dtype=np.int16).astype(np.float32) / 32768.0
+
+
 def get_audio_duration(audio_path: Path) -> float:
     result = subprocess.run(
         ["ffprobe", "-v", "error", "-show_entries", "format=duration",
@@ -34,22 +88,59 @@ def get_audio_duration(audio_path: Path) -> float:
     return float(result.stdout.strip())
 
 
-def diarize(audio_path: Path, hf_token: str) -> list[tuple[float, float, str]]:
-    print("Running speaker diarization...")
+@contextlib.contextmanager
+def _patched_torch_load():
+    """Make torch.load default to weights_only=False for the duration of the block.
+
+    pyannote checkpoints need this with PyTorch 2.6+. torch.load is a module
+    global, so the swap and the restore happen under _TORCH_LOAD_LOCK.
+    """
+    with _TORCH_LOAD_LOCK:
+        orig_load = torch.load
+        torch.load = lambda *a, **kw: orig_load(*a, **{**kw, "weights_only": False})
+        try:
+            yield
+        finally:
+            torch.load = orig_load
+
+
+@functools.lru_cache(maxsize=1)
+def load_diarizer(hf_token: str) -> Pipeline:
+    """Load the pyannote pipeline once per process; later calls reuse it."""
     print("  ⏳ Lade pyannote Modell...")
-    # pyannote checkpoints require weights_only=False with PyTorch 2.6+
-    _orig_load = torch.load
-    torch.load = lambda *a, **kw: _orig_load(*a, **{**kw, "weights_only": False})
-    pipeline = Pipeline.from_pretrained(
-        "pyannote/speaker-diarization-3.1",
-        token=hf_token,
-    )
-    torch.load = _orig_load
+    with _patched_torch_load():
+        pipeline = Pipeline.from_pretrained(
+            DIARIZATION_MODEL,
+            token=hf_token,
+        )
     device = "mps" if torch.backends.mps.is_available() else "cpu"
-    print(f"  ⏳ Diarisierung auf {device.upper()}...")
+    print(f"  ✅ pyannote geladen ({device.upper()})")
     pipeline.to(torch.device(device))
+    return pipeline
+
+
+def diarize(
+    audio_path: Path,
+    hf_token: str,
+    audio: np.ndarray | None = None,
+    audio_digest: str | None = None
+) -> list[tuple[float, float, str]]:
+    # Same audio and model: reuse the earlier speaker turns
+    audio_digest = audio_digest or cache.file_digest(audio_path)
+    cache_key = cache.text_digest(audio_digest, DIARIZATION_MODEL)
+    if (cached := cache.load_json(cache_key, "diarization.json")) is not None:
+        turns = [tuple(t) for t in cached]
+        print(f"  ✅ Sprecher-Erkennung aus Cache ({len(set(t[2] for t in turns))} Sprecher)")
+        return turns
 
-    result = pipeline(str(audio_path))
+    print("Running speaker diarization...")
+    pipeline = load_diarizer(hf_token)
+
+    if audio is not None:
+        # Already decoded samples: pyannote takes a (channel, time) waveform
+        result = pipeline({"waveform": torch.from_numpy(audio).unsqueeze(0), "sample_rate": SAMPLE_RATE})
+    else:
+        result = pipeline(str(audio_path))
 
     turns = []
     annotation = result.speaker_diarization if hasattr(result, 'speaker_diarization') else result
@@ -57,46 +148,124 @@ def diarize(audio_path: Path, hf_token: str) -> list[tuple[float, float, str]]:
         turns.append((turn.start, turn.end, speaker))
     num_speakers = len(set(t[2] for t in turns))
     print(f"  Found {num_speakers} speakers")
+    cache.save_json(cache_key, "diarization.json", turns)
     return turns
 
 
 def assign_speakers(segments: list[dict], speaker_turns: list[tuple[float, float, str]]) -> list[dict]:
+    """Label each segment with the first turn (by start time) containing its midpoint."""
+    # pyannote yields turns sorted by start; the stable sort is then a no-op
+    turns = sorted(speaker_turns, key=lambda t: t[0])
+    starts = [t[0] for t in turns]
+    # Running maximum of turn ends: the first index where it reaches seg_mid is the
+    # first turn that ends at or after seg_mid (turns may overlap)
+    max_ends = list(itertools.accumulate((t[1] for t in turns), max))
     for seg in segments:
         seg_mid = (seg["start"] + seg["end"]) / 2
-        best_speaker = "Unknown"
-        for start, end, speaker in speaker_turns:
-            if start <= seg_mid <= end:
-                best_speaker = speaker
-                break
-        seg["speaker"] = best_speaker
+        last = bisect.bisect_right(starts, seg_mid) - 1
+        first = bisect.bisect_left(max_ends, seg_mid)
+        seg["speaker"] = turns[first][2] if first <= last else "Unknown"
     return segments
 
 
-def transcribe(audio_path: Path, model_name: str, language: str) -> dict:
+@functools.lru_cache(maxsize=2)
+def load_whisper(model_name: str):
+    """Load a Whisper model once per process; later calls reuse it."""
+    if WhisperModel is not None:
+        # CTranslate2 has no MPS backend: CUDA with int8 weights/fp16 compute, else int8 on CPU
+        device = "cuda" if torch.cuda.is_available() else "cpu"
+        compute_type = "int8_float16" if device == "cuda" else "int8"
+        print(f"Using device: {device} (faster-whisper, {compute_type})")
+
+        print(f"  ⏳ Lade Whisper Modell '{model_name}'...")
+        model = WhisperModel(FASTER_WHISPER_MODELS.get(model_name, model_name),
+                             device=device, compute_type=compute_type)
+        print(f"  ✅ Modell geladen")
+        return model
+
     device = "mps" if torch.backends.mps.is_available() else "cpu"
     print(f"Using device: {device}")
 
     print(f"  ⏳ Lade Whisper Modell '{model_name}'...")
-    model = whisper.load_model(model_name, device=device)
+    with _TORCH_LOAD_LOCK:
+        model = whisper.load_model(model_name, device=device)
     print(f"  ✅ Modell geladen")
-
-    duration = get_audio_duration(audio_path)
+    return model
+
+
+def transcribe(
+    audio_path: Path,
+    model_name: str,
+    language: str,
+    audio: np.ndarray | None = None,
+    audio_digest: str | None = None
+) -> dict:
+    """Transcribe audio_path (or its already decoded samples).
+
+    audio_digest is cache.file_digest(audio_path), if the caller already has it.
+    """
+    # Same audio, model and language: reuse the earlier result
+    backend = "faster-whisper" if WhisperModel is not None else "openai-whisper"
+    audio_digest = audio_digest or cache.file_digest(audio_path)
+    cache_key = cache.text_digest(audio_digest, backend, model_name, language)
+    if (cached := cache.load_json(cache_key, "transcript.json")) is not None:
+        print(f"  ✅ Transkription aus Cache ({len(cached['segments'])} Segmente)")
+        return cached
+
+    model = load_whisper(model_name)
+
+    duration = len(audio) / SAMPLE_RATE if audio is not None else get_audio_duration(audio_path)
     print(f"Audio duration: {duration / 60:.1f} minutes")
 
     start = time.time()
 
-    result = model.transcribe(
-        str(audio_path),
-        language=language,
-        verbose=False,
-    )
-
-    for seg in result["segments"]:
+    def report(seg: dict) -> None:
         pct = min(100, seg["end"] / duration * 100)
         elapsed = time.time() - start
         print(f"\r  [{pct:5.1f}%] {elapsed:.0f}s elapsed — {seg['start']:.0f}s-{seg['end']:.0f}s", end="", flush=True)
 
+    if WhisperModel is not None and isinstance(model, WhisperModel):
+        # faster-whisper decodes lazily, so progress is live; convert to openai-whisper's dict shape
+        segments_iter, _info = model.transcribe(audio if audio is not None else str(audio_path), language=language)
+        segments = []
+        for s in segments_iter:
+            seg = {"id": len(segments), "start": s.start, "end": s.end, "text": s.text}
+            segments.append(seg)
+            report(seg)
+        result = {"text": "".join(seg["text"] for seg in segments), "segments": segments, "language": language}
+    else:
+        result = model.transcribe(
+            audio if audio is not None else str(audio_path),
+            language=language,
+            verbose=False,
+        )
+        for seg in result["segments"]:
+            report(seg)
+
     print()
+    # Only what downstream code uses (openai-whisper segments also carry tokens etc.)
+    cache.save_json(cache_key, "transcript.json", {
+        "text": result["text"],
+        "segments": [{"start": seg["start"], "end": seg["end"], "text": seg["text"]} for seg in result["segments"]],
+    })
+    return result
+
+
+def transcribe_and_diarize(audio_path: Path, model_name: str, language: str, hf_token: str | None) -> dict:
+    """Run Whisper and (with hf_token) pyannote concurrently on the same audio.
+
+    Both are independent and spend most of their time in native code, so the
+    wall time is roughly the longer of the two instead of their sum.
+    """
+    # Decode and hash the WAV once and hand the same samples/digest to both models
+    audio = load_audio(audio_path)
+    audio_digest = cache.file_digest(audio_path)
+    with ThreadPoolExecutor(max_workers=2) as ex:
+        fut_transcribe = ex.submit(transcribe, audio_path, model_name, language, audio, audio_digest)
+        fut_diarize = ex.submit(diarize, audio_path, hf_token, audio, audio_digest) if hf_token else None
+        result = fut_transcribe.result()
+        if fut_diarize:
+            assign_speakers(result["segments"], fut_diarize.result())
     return result
 
 
@@ -105,19 +274,28 @@ SPEAKER_MAP_FILE = Path(__file__).parent / "speakers.json"
 
 def load_speaker_map() -> dict[str, str]:
     if SPEAKER_MAP_FILE.exists():
-        return json.loads(SPEAKER_MAP_FILE.read_text())
+        return json.loads(SPEAKER_MAP_FILE.read_bytes())
     return {}
 
 
-def save_speaker_map(name_map: dict[str, str]) -> None:
-    existing = load_speaker_map()
+def dump_json(data) -> bytes:
+    """Serialize to indented UTF-8 JSON (orjson if installed, else the json module)."""
+    if orjson is not None:
+        return orjson.dumps(data, option=orjson.OPT_INDENT_2)
+    return json.dumps(data, indent=2, ensure_ascii=False).encode("utf-8")
+
+
+def save_speaker_map(name_map: dict[str, str], existing: dict[str, str] | None = None) -> None:
+    """Merge name_map into speakers.json; pass the already loaded map as existing to skip re-reading it."""
+    existing = dict(existing) if existing is not None else load_speaker_map()
     existing.update(name_map)
-    SPEAKER_MAP_FILE.write_text(json.dumps(existing, indent=2, ensure_ascii=False))
+    SPEAKER_MAP_FILE.write_bytes(dump_json(existing))
     print(f"Speaker names saved to {SPEAKER_MAP_FILE}")
 
 
 def collect_speaker_samples(segments: list[dict]) -> dict[str, str]:
     """Collect the first quote from each speaker for identification."""
+    speakers = {seg.get("speaker", "Unknown") for seg in segments}
     samples = {}
     for seg in segments:
         speaker = seg.get("speaker", "Unknown")
@@ -125,16 +303,29 @@ def collect_speaker_samples(segments: list[dict]) -> dict[str, str]:
             text = seg["text"].strip()
             if len(text) > 10:
                 samples[speaker] = text[:120]
+                # Every speaker has a quote: the rest of the transcript can't change the result
+                if len(samples) == len(speakers):
+                    break
     return samples
 
 
-def prompt_speaker_names(segments: list[dict]) -> dict[str, str]:
-    """Show speaker samples and ask user to assign real names."""
+def prompt_speaker_names(segments: list[dict], saved: dict[str, str] | None = None) -> dict[str, str]:
+    """Show speaker samples and ask user to assign real names.
+
+    saved is the already loaded speakers.json (read here if not given).
+    """
     samples = collect_speaker_samples(segments)
     if not samples:
         return {}
 
-    saved = load_speaker_map()
+    if saved is None:
+        saved = load_speaker_map()
+
+    if not sys.stdin.isatty():
+        # Scripted run: nobody can answer, use the known names as they are
+        known = {speaker: saved[speaker] for speaker in samples if speaker in saved}
+        print(f"No terminal for speaker names, using {len(known)} known name(s) from {SPEAKER_MAP_FILE.name}")
+        return known
 
     print("\n--- Speaker Identification ---")
     print("Enter a name for each speaker (or press Enter to keep as-is).")
@@ -187,6 +378,14 @@ def format_timestamp(seconds: float) -> str:
 
 
 def format_output(segments: list[dict], with_speakers: bool, with_timestamps: bool = True) -> str:
+    if not (with_speakers or with_timestamps):
+        return "".join(seg["text"].strip() for seg in segments)
+
+    # Few distinct speakers: intern them once so the change test is an identity check
+    interned = {}
+    if with_speakers:
+        interned = {s: sys.intern(s) for s in {seg.get("speaker", "Unknown") for seg in segments}}
+
     lines = []
     current_speaker = None
     for seg in segments:
@@ -198,8 +397,8 @@ def format_output(segments: list[dict], with_speakers: bool, with_timestamps: bo
             header_parts.append(f"[{start_ts} - {end_ts}]")
 
         if with_speakers:
-            speaker = seg.get("speaker", "Unknown")
-            if speaker != current_speaker:
+            speaker = interned[seg.get("speaker", "Unknown")]
+            if speaker is not current_speaker:
                 current_speaker = speaker
                 header_parts.append(f"[{speaker}]")
 
@@ -208,37 +407,23 @@ def format_output(segments: list[dict], with_speakers: bool, with_timestamps: bo
 
         lines.append(seg["text"].strip())
 
-    if with_speakers or with_timestamps:
-        return "\n".join(lines).strip()
-    return "".join(lines)
-
-
-def main():
-    parser = argparse.ArgumentParser(description="Transcribe audio from video files")
-    parser.add_argument("input", help="Path to video or audio file")
-    parser.add_argument("--model", default="turbo", help="Whisper model (default: turbo)")
-    parser.add_argument("--language", default="de", help="Language code (default: de)")
-    parser.add_argument("--output", help="Output text file path")
-    parser.add_argument("--hf-token", default=os.environ.get("HF_TOKEN"),
-                        help="HuggingFace token for speaker diarization (or set HF_TOKEN env var)")
-    parser.add_argument("--no-diarize", action="store_true", help="Skip speaker diarization")
-    parser.add_argument("--no-timestamps", action="store_true", help="Omit timestamps from output")
-    parser.add_argument("--interactive", action="store_true",
-                        help="Interactively prompt for speaker names (default: auto-name as Speaker-1, Speaker-2, ...)")
-    args = parser.parse_args()
-
-    input_path = Path(args.input)
-    if not input_path.exists():
-        sys.exit(f"File not found: {input_path}")
+    return "\n".join(lines).strip()
 
-    if not shutil.which("ffmpeg"):
-        sys.exit("ffmpeg not found. Install with: brew install ffmpeg")
 
-    do_diarize = not args.no_diarize and args.hf_token is not None
-    if not args.no_diarize and args.hf_token is None:
-        print("No HF token provided, skipping speaker diarization. Use --hf-token or set HF_TOKEN.")
+def transcribe_file(
+    input_path: Path,
+    output_path: Path,
+    args: argparse.Namespace,
+    do_diarize: bool,
+    saved: dict[str, str] | None = None,
+    names: dict[str, str] | None = None
+) -> dict[str, str]:
+    """Transcribe (and diarize) one input file and write its transcript.
 
-    output_path = Path(args.output) if args.output else input_path.with_suffix(".txt")
+    names (from --names-file) replaces the interactive prompt. Returns the
+    speaker names entered interactively (saved holds the known names used
+    as hints); the caller persists them.
+    """
     video_extensions = {".mov", ".mp4", ".mkv", ".avi", ".webm", ".m4v"}
 
     if input_path.suffix.lower() in video_extensions:
@@ -248,25 +433,23 @@ def main():
         try:
             extract_audio(input_path, tmp_path)
             print(f"Transcribing with model '{args.model}' (language: {args.language})...")
-            result = transcribe(tmp_path, args.model, args.language)
-            if do_diarize:
-                speaker_turns = diarize(tmp_path, args.hf_token)
-                assign_speakers(result["segments"], speaker_turns)
+            result = transcribe_and_diarize(tmp_path, args.model, args.language,
+                                            args.hf_token if do_diarize else None)
         finally:
             tmp_path.unlink(missing_ok=True)
     else:
         print(f"Transcribing {input_path.name} with model '{args.model}' (language: {args.language})...")
-        result = transcribe(input_path, args.model, args.language)
-        if do_diarize:
-            speaker_turns = diarize(input_path, args.hf_token)
-            assign_speakers(result["segments"], speaker_turns)
+        result = transcribe_and_diarize(input_path, args.model, args.language,
+                                        args.hf_token if do_diarize else None)
 
+    entered = {}
     if do_diarize:
-        if args.interactive:
-            name_map = prompt_speaker_names(result["segments"])
-            if name_map:
-                apply_speaker_names(result["segments"], name_map)
-                save_speaker_map(name_map)
+        if names:
+            apply_speaker_names(result["segments"], names)
+        elif args.interactive:
+            entered = prompt_speaker_names(result["segments"], saved)
+            if entered:
+                apply_speaker_names(result["segments"], entered)
         else:
             # Auto-name speakers as Speaker-1, Speaker-2, etc.
             name_map = auto_name_speakers(result["segments"])
@@ -277,6 +460,89 @@ def main():
     text = format_output(result["segments"], with_speakers=do_diarize, with_timestamps=not args.no_timestamps)
     output_path.write_text(text, encoding="utf-8")
     print(f"Transcript saved to {output_path}")
+    return entered
+
+
+def _init_worker(threads: int) -> None:
+    # Split the cores between the worker processes instead of each torch using all of them
+    torch.set_num_threads(threads)
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Transcribe audio from video files")
+    parser.add_argument("input", nargs="+", help="Path(s) to video or audio files")
+    parser.add_argument("--model", default="turbo", help="Whisper model (default: turbo)")
+    parser.add_argument("--language", default="de", help="Language code (default: de)")
+    parser.add_argument("--output", help="Output text file path (single input only)")
+    parser.add_argument("--hf-token", default=os.environ.get("HF_TOKEN"),
+                        help="HuggingFace token for speaker diarization (or set HF_TOKEN env var)")
+    parser.add_argument("--no-diarize", action="store_true", help="Skip speaker diarization")
+    parser.add_argument("--no-timestamps", action="store_true", help="Omit timestamps from output")
+    parser.add_argument("--interactive", action="store_true",
+                        help="Interactively prompt for speaker names (default: auto-name as Speaker-1, Speaker-2, ...)")
+    parser.add_argument("--names-file", type=Path, metavar="JSON",
+                        help="JSON file mapping speaker IDs (SPEAKER_00, ...) to names; no prompting")
+    parser.add_argument("--jobs", type=int, default=1, metavar="N",
+                        help="Transcribe N files in parallel processes (CPU only, default: 1)")
+    args = parser.parse_args()
+
+    input_paths = [Path(p) for p in args.input]
+    for input_path in input_paths:
+        if not input_path.exists():
+            sys.exit(f"File not found: {input_path}")
+    if args.output and len(input_paths) > 1:
+        parser.error("--output can only be used with a single input")
+
+    names = None
+    if args.names_file:
+        try:
+            names = json.loads(args.names_file.read_bytes())
+        except (OSError, ValueError) as e:
+            sys.exit(f"Cannot read names file {args.names_file}: {e}")
+
+    if not shutil.which("ffmpeg"):
+        sys.exit("ffmpeg not found. Install with: brew install ffmpeg")
+
+    do_diarize = not args.no_diarize and args.hf_token is not None
+    if not args.no_diarize and args.hf_token is None:
+        print("No HF token provided, skipping speaker diarization. Use --hf-token or set HF_TOKEN.")
+
+    # speakers.json is read once; names entered for earlier files become hints for later
+    # ones and everything is written back in a single save at the end
+    saved = load_speaker_map() if do_diarize and args.interactive and not names else None
+    new_names = {}
+
+    # Interactive naming needs the terminal; a GPU is already saturated by one process
+    jobs = 1 if saved is not None else min(max(1, args.jobs), len(input_paths))
+    if jobs > 1 and (torch.cuda.is_available() or torch.backends.mps.is_available()):
+        print("GPU available, ignoring --jobs: files are transcribed one after another.")
+        jobs = 1
+
+    if jobs > 1:
+        # Each process loads its own models once and keeps them for all of its files
+        print(f"Transcribing {len(input_paths)} files in {jobs} processes...")
+        threads = max(1, (os.cpu_count() or 1) // jobs)
+        with ProcessPoolExecutor(max_workers=jobs, initializer=_init_worker, initargs=(threads,)) as pool:
+            futures = [
+                pool.submit(transcribe_file, input_path, input_path.with_suffix(".txt"), args, do_diarize,
+                            names=names)
+                for input_path in input_paths
+            ]
+            for future in futures:
+                future.result()
+        return
+
+    # Models are loaded on first use and shared by all inputs
+    try:
+        for input_path in input_paths:
+            output_path = Path(args.output) if args.output else input_path.with_suffix(".txt")
+            entered = transcribe_file(input_path, output_path, args, do_diarize, saved, names)
+            if entered:
+                saved.update(entered)
+                new_names.update(entered)
+    finally:
+        if new_names:
+            save_speaker_map(new_names, saved)
 
 
 if __name__ == "__main__":